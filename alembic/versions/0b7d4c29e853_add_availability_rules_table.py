@@ -0,0 +1,48 @@
+"""add availability rules table
+
+Revision ID: 0b7d4c29e853
+Revises: f2a96b0d4e17
+Create Date: 2026-10-17 15:08:36.270415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7d4c29e853'
+down_revision: Union[str, Sequence[str], None] = 'f2a96b0d4e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('availability_rules',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('equipment_id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('weekdays', sa.SmallInteger(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('timezone', sa.String(), server_default='Asia/Kolkata', nullable=False),
+    sa.Column('valid_from', sa.Date(), nullable=False),
+    sa.Column('valid_until', sa.Date(), nullable=True),
+    sa.Column('exceptions', postgresql.ARRAY(sa.Date()), server_default='{}', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_availability_rules_owner_id'), 'availability_rules', ['owner_id'], unique=False)
+    op.create_index('ix_availability_rules_equipment_validity', 'availability_rules', ['equipment_id', 'valid_from', 'valid_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_availability_rules_equipment_validity', table_name='availability_rules')
+    op.drop_index(op.f('ix_availability_rules_owner_id'), table_name='availability_rules')
+    op.drop_table('availability_rules')
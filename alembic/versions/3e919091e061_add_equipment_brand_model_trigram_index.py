@@ -0,0 +1,33 @@
+"""add equipment brand/model trigram index
+
+Revision ID: 3e919091e061
+Revises: 7baae1052078
+Create Date: 2026-10-17 11:41:05.377120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e919091e061'
+down_revision: Union[str, Sequence[str], None] = '7baae1052078'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Expression must match BRAND_MODEL_TEXT in app/services/equipment.py
+    op.execute(
+        "CREATE INDEX ix_equipment_brand_model_trgm ON equipment "
+        "USING gin ((coalesce(brand, '') || ' ' || coalesce(model, '')) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_equipment_brand_model_trgm', table_name='equipment')
@@ -0,0 +1,36 @@
+"""add booking overlap exclusion constraint
+
+Revision ID: 5b2f0c8d9e41
+Revises: 3e919091e061
+Create Date: 2026-10-17 12:20:44.913508
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2f0c8d9e41'
+down_revision: Union[str, Sequence[str], None] = '3e919091e061'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist provides the GiST "=" operator class for the uuid column
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # Fails if overlapping PENDING/ACCEPTED bookings already exist – resolve them first.
+    # Expression must match BOOKING_PERIOD in app/services/availability.py
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_equipment_period "
+        "EXCLUDE USING gist (equipment_id WITH =, tstzrange(start_ts, end_ts, '[)') WITH &&) "
+        "WHERE (status IN ('PENDING', 'ACCEPTED'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_bookings_equipment_period', 'bookings', type_='exclude')
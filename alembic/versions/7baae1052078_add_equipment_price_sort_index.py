@@ -0,0 +1,28 @@
+"""add equipment price sort index
+
+Revision ID: 7baae1052078
+Revises: c76a1e611c88
+Create Date: 2026-10-17 10:03:17.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7baae1052078'
+down_revision: Union[str, Sequence[str], None] = 'c76a1e611c88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_equipment_status_rate_id', 'equipment', ['status', 'daily_rate', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_equipment_status_rate_id', table_name='equipment')
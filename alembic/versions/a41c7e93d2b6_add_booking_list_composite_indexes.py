@@ -0,0 +1,41 @@
+"""add booking list composite indexes
+
+Revision ID: a41c7e93d2b6
+Revises: 5b2f0c8d9e41
+Create Date: 2026-10-17 13:02:17.448190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c7e93d2b6'
+down_revision: Union[str, Sequence[str], None] = '5b2f0c8d9e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_renter_created_id', 'bookings', ['renter_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_bookings_equipment_created_id', 'bookings', ['equipment_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_bookings_equipment_status_start', 'bookings', ['equipment_id', 'status', 'start_ts'], unique=False)
+    # Single-column duplicates, now prefixes of the composites above
+    op.drop_index('ix_booking_equipment', table_name='bookings', if_exists=True)
+    op.drop_index('ix_bookings_equipment_id', table_name='bookings', if_exists=True)
+    op.drop_index('ix_booking_renter', table_name='bookings', if_exists=True)
+    op.drop_index('ix_bookings_renter_id', table_name='bookings', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_bookings_renter_id'), 'bookings', ['renter_id'], unique=False)
+    op.create_index('ix_booking_renter', 'bookings', ['renter_id'], unique=False)
+    op.create_index(op.f('ix_bookings_equipment_id'), 'bookings', ['equipment_id'], unique=False)
+    op.create_index('ix_booking_equipment', 'bookings', ['equipment_id'], unique=False)
+    op.drop_index('ix_bookings_equipment_status_start', table_name='bookings')
+    op.drop_index('ix_bookings_equipment_created_id', table_name='bookings')
+    op.drop_index('ix_bookings_renter_created_id', table_name='bookings')
@@ -0,0 +1,28 @@
+"""add equipment listing keyset index
+
+Revision ID: c76a1e611c88
+Revises: 899d46ddf5ea
+Create Date: 2026-10-17 09:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c76a1e611c88'
+down_revision: Union[str, Sequence[str], None] = '899d46ddf5ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_equipment_status_created_id', 'equipment', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_equipment_status_created_id', table_name='equipment')
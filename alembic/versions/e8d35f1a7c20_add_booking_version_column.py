@@ -0,0 +1,28 @@
+"""add booking version column
+
+Revision ID: e8d35f1a7c20
+Revises: a41c7e93d2b6
+Create Date: 2026-10-17 13:47:52.106734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8d35f1a7c20'
+down_revision: Union[str, Sequence[str], None] = 'a41c7e93d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bookings', 'version')
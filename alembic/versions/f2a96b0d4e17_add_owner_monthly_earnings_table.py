@@ -0,0 +1,39 @@
+"""add owner monthly earnings table
+
+Revision ID: f2a96b0d4e17
+Revises: e8d35f1a7c20
+Create Date: 2026-10-17 14:25:09.581347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a96b0d4e17'
+down_revision: Union[str, Sequence[str], None] = 'e8d35f1a7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('owner_monthly_earnings',
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('completed_bookings', sa.Integer(), nullable=False),
+    sa.Column('gross', sa.Integer(), nullable=False),
+    sa.Column('commission', sa.Integer(), nullable=False),
+    sa.Column('earnings', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id', 'month')
+    )
+    # Existing COMPLETED bookings: run `python -m app.services.earnings` to backfill
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('owner_monthly_earnings')
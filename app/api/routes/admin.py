@@ -13,6 +13,14 @@ from app.schemas.equipment import EquipmentOut
 from app.schemas.user import OwnerProfileRead
 from app.schemas.audit_log import AuditLogRead
 from app.core.authz import require_admin  # ✅ centralized
+from app.core.principal import principal_cache, invalidate_principal
+from app.core.security import token_cache
+from app.services.geo_index import equipment_index, rebuild_equipment_index
+from app.services.suggest import suggest_index, rebuild_suggest_index
+from app.services.equipment import equipment_cache, invalidate_equipment
+from app.services.booking_expiry import expire_stale_bookings
+from app.services.calendar import calendar_cache
+from app.services.earnings import reconcile_owner_earnings
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -73,6 +81,9 @@ async def approve_equipment(
 
     await session.commit()
     await session.refresh(eq)
+    equipment_index.sync(eq)
+    suggest_index.sync(eq)
+    await invalidate_equipment(equipment_id, listings=True)
     return eq
 
 
@@ -88,14 +99,60 @@ async def reject_equipment(
     if eq.status == EquipmentStatus.REJECTED:
         raise HTTPException(status_code=409, detail="Already rejected")
 
+    was_listed = eq.status == EquipmentStatus.APPROVED
     eq.status = EquipmentStatus.REJECTED
     await record_admin_action(session, admin.id, AuditAction.REJECT_EQUIPMENT, "Equipment", equipment_id)
 
     await session.commit()
     await session.refresh(eq)
+    equipment_index.sync(eq)
+    suggest_index.sync(eq)
+    await invalidate_equipment(equipment_id, listings=was_listed)
     return eq
 
 
+@router.post("/equipment-index/rebuild")
+async def rebuild_geo_index(
+    admin=Depends(require_admin),
+):
+    """Rebuild this worker's in-memory equipment indexes (geo + autocomplete) from the database."""
+    count = await rebuild_equipment_index()
+    phrases = await rebuild_suggest_index()
+    return {"message": "Equipment index rebuilt", "count": count, "suggest_phrases": phrases}
+
+
+@router.post("/bookings/expire")
+async def run_booking_expiry(
+    admin=Depends(require_admin),
+):
+    """Run the stale PENDING booking sweeper now instead of waiting for the next tick."""
+    expired = await expire_stale_bookings()
+    return {"message": "Booking expiry ran", "expired": expired}
+
+
+@router.post("/earnings/reconcile")
+async def run_earnings_reconcile(
+    owner_id: UUID | None = None,
+    admin=Depends(require_admin),
+):
+    """Rebuild owner_monthly_earnings from raw bookings (one owner, or everyone)."""
+    rows = await reconcile_owner_earnings(owner_id)
+    return {"message": "Owner earnings reconciled", "rows": rows}
+
+
+@router.get("/cache/stats")
+async def response_cache_stats(
+    admin=Depends(require_admin),
+):
+    """Hit/miss counters for this worker's response caches."""
+    return {
+        "equipment": equipment_cache.snapshot(),
+        "calendar": calendar_cache.snapshot(),
+        "principal": principal_cache.snapshot(),
+        "jwt": token_cache.snapshot(),
+    }
+
+
 # -------- User (Owner) KYC approvals --------
 @router.get("/users/kyc/pending", response_model=list[OwnerProfileRead])
 async def list_pending_kyc(
@@ -126,6 +183,7 @@ async def verify_user_kyc(
 
     await session.commit()
     await session.refresh(profile)
+    await invalidate_principal(user_id)
     return profile
 
 
@@ -146,6 +204,7 @@ async def mark_user_kyc_pending(
 
     await session.commit()
     await session.refresh(profile)
+    await invalidate_principal(user_id)
     return profile
 
 
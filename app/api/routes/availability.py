@@ -1,12 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from uuid import UUID
 
 from app.db.session import get_session
-from app.db.models.availability import Availability
+from app.db.models.availability import Availability, AvailabilityRule
 from app.db.models.equipment import Equipment
-from app.schemas.availability import AvailabilityCreate, AvailabilityOut
+from app.schemas.availability import (
+    AvailabilityCreate,
+    AvailabilityOut,
+    AvailabilityRuleCreate,
+    AvailabilityRuleExceptions,
+    AvailabilityRuleOut,
+    AvailabilityWindowOut,
+    EquipmentSlotsOut,
+    EquipmentWindowsOut,
+    FreeSlotSearch,
+)
+from app.services.availability_rules import (
+    MAX_EXPANSION_DAYS,
+    MAX_RANGE_EQUIPMENT,
+    availability_cache,
+    availability_group,
+    availability_windows,
+    invalidate_availability,
+    stream_windows,
+    weekdays_to_mask,
+    windows_cache_key,
+)
+from app.services.calendar import invalidate_calendars
+from app.services.slots import MAX_SLOT_EQUIPMENT, MAX_SLOTS_PER_EQUIPMENT, find_free_slots
 from app.utils.jwt import require_role
 
 router = APIRouter(prefix="/availability", tags=["availability"])
@@ -26,36 +51,238 @@ async def create_availability(
 
     # Check overlap for same equipment
     overlap_query = await session.execute(
-        select(Availability).where(
+        select(Availability.id).where(
             and_(
                 Availability.equipment_id == payload.equipment_id,
-                Availability.start_time < payload.end_time,
-                Availability.end_time > payload.start_time,
+                Availability.start_ts < payload.end_ts,
+                Availability.end_ts > payload.start_ts,
             )
-        )
+        ).limit(1)
     )
-    if overlap_query.scalar_one_or_none():
+    if overlap_query.first():
         raise HTTPException(status_code=400, detail="Overlapping availability exists")
 
     availability = Availability(
         equipment_id=payload.equipment_id,
         owner_id=user.id,
-        start_time=payload.start_time,
-        end_time=payload.end_time,
+        start_ts=payload.start_ts,
+        end_ts=payload.end_ts,
     )
     session.add(availability)
     await session.commit()
     await session.refresh(availability)
+    await _invalidate_windows(availability.equipment_id)
     return availability
 
 
-@router.get("/{equipment_id}", response_model=list[AvailabilityOut])
-async def list_availability(
+async def _invalidate_windows(equipment_id: UUID) -> None:
+    await invalidate_availability(equipment_id)
+    await invalidate_calendars(equipment_id)
+
+
+def _check_range(start: datetime, end: datetime) -> None:
+    if start.tzinfo is None or end.tzinfo is None:
+        raise HTTPException(status_code=400, detail="start and end must include a timezone offset")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=MAX_EXPANSION_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_EXPANSION_DAYS} days")
+
+
+async def _owned_rule(session: AsyncSession, rule_id: UUID, user) -> AvailabilityRule:
+    rule = await session.get(AvailabilityRule, rule_id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Availability rule not found")
+    if rule.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not your availability rule")
+    return rule
+
+
+# -----------------------------
+# Multi-equipment range read
+# -----------------------------
+@router.get(
+    "/range",
+    response_class=StreamingResponse,
+    responses={200: {
+        "description": "NDJSON: one EquipmentWindowsOut object per line",
+        "content": {"application/x-ndjson": {}},
+    }},
+)
+async def list_availability_range(
+    equipment_id: list[UUID] = Query(..., description="Repeat for each machine"),
+    start: datetime = Query(..., description="Range start (ISO 8601, with offset)"),
+    end: datetime = Query(..., description="Range end (ISO 8601, with offset)"),
+    user=Depends(require_role("OWNER", "FARMER"))
+):
+    """
+    Windows intersecting [start, end) for many machines in one request (map
+    and search pins). One range scan on ix_availability_start_end plus one
+    rules query; streamed as NDJSON, one line per machine:
+
+        {"equipment_id": "...", "windows": [{"start_ts": "...", "end_ts": "..."}]}
+    """
+    _check_range(start, end)
+    if len(set(equipment_id)) > MAX_RANGE_EQUIPMENT:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_RANGE_EQUIPMENT} equipment ids per request")
+
+    async def lines():
+        async for eid, windows in stream_windows(equipment_id, start, end):
+            out = EquipmentWindowsOut(
+                equipment_id=eid,
+                windows=[AvailabilityWindowOut(start_ts=s, end_ts=e) for s, e in windows],
+            )
+            yield out.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/slots", response_model=list[EquipmentSlotsOut])
+async def search_free_slots(
+    payload: FreeSlotSearch,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER", "FARMER"))
+):
+    """
+    First free slots of at least min_hours in [start, end) for a batch of
+    machines (search results' "next free 2-day slot"). Windows minus active
+    bookings, computed in memory from batch queries.
+    """
+    _check_range(payload.start, payload.end)
+    if len(set(payload.equipment_ids)) > MAX_SLOT_EQUIPMENT:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SLOT_EQUIPMENT} equipment ids per request")
+    if payload.count > MAX_SLOTS_PER_EQUIPMENT:
+        raise HTTPException(status_code=400, detail=f"count is limited to {MAX_SLOTS_PER_EQUIPMENT}")
+    slots = await find_free_slots(
+        session,
+        payload.equipment_ids,
+        payload.start,
+        payload.end,
+        timedelta(hours=payload.min_hours),
+        payload.count,
+    )
+    return [
+        {"equipment_id": eid, "slots": [{"start_ts": s, "end_ts": e} for s, e in slots[eid]]}
+        for eid in dict.fromkeys(payload.equipment_ids)
+    ]
+
+
+# -----------------------------
+# Recurring rules
+# -----------------------------
+@router.post("/rules", response_model=AvailabilityRuleOut)
+async def create_availability_rule(
+    payload: AvailabilityRuleCreate,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER"))
+):
+    """One row for a whole weekly pattern; windows are expanded when read."""
+    equipment = await session.get(Equipment, payload.equipment_id)
+    if not equipment:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    if equipment.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not your equipment")
+
+    rule = AvailabilityRule(
+        equipment_id=payload.equipment_id,
+        owner_id=user.id,
+        weekdays=weekdays_to_mask(payload.weekdays),
+        start_time=payload.start_time,
+        end_time=payload.end_time,
+        timezone=payload.timezone,
+        valid_from=payload.valid_from,
+        valid_until=payload.valid_until,
+        exceptions=sorted(set(payload.exceptions)),
+    )
+    session.add(rule)
+    await session.commit()
+    await session.refresh(rule)
+    await _invalidate_windows(rule.equipment_id)
+    return rule
+
+
+@router.post("/rules/{rule_id}/exceptions", response_model=AvailabilityRuleOut)
+async def add_availability_rule_exceptions(
+    rule_id: UUID,
+    payload: AvailabilityRuleExceptions,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER"))
+):
+    """Skip the given local dates (machine in repair, holiday, …)."""
+    rule = await _owned_rule(session, rule_id, user)
+    rule.exceptions = sorted(set(rule.exceptions or ()) | set(payload.days))
+    await session.commit()
+    await session.refresh(rule)
+    await _invalidate_windows(rule.equipment_id)
+    return rule
+
+
+@router.delete("/rules/{rule_id}", status_code=204)
+async def delete_availability_rule(
+    rule_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER"))
+):
+    rule = await _owned_rule(session, rule_id, user)
+    equipment_id = rule.equipment_id
+    await session.delete(rule)
+    await session.commit()
+    await _invalidate_windows(equipment_id)
+    return Response(status_code=204)
+
+
+@router.get("/{equipment_id}/rules", response_model=list[AvailabilityRuleOut])
+async def list_availability_rules(
     equipment_id: UUID,
     session: AsyncSession = Depends(get_session),
     user=Depends(require_role("OWNER", "FARMER"))
 ):
     res = await session.execute(
-        select(Availability).where(Availability.equipment_id == equipment_id)
+        select(AvailabilityRule)
+        .where(AvailabilityRule.equipment_id == equipment_id)
+        .order_by(AvailabilityRule.valid_from)
     )
     return list(res.scalars())
+
+
+@router.get("/{equipment_id}/windows", response_model=list[AvailabilityWindowOut])
+async def list_availability_windows(
+    equipment_id: UUID,
+    start: datetime = Query(..., description="Range start (ISO 8601, with offset)"),
+    end: datetime = Query(..., description="Range end (ISO 8601, with offset)"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER", "FARMER"))
+):
+    """Concrete windows (rows + expanded rules, merged) within [start, end)."""
+    _check_range(start, end)
+
+    key = windows_cache_key(equipment_id, start, end)
+    group = availability_group(equipment_id)
+    body = await availability_cache.get(key, group=group)
+    if body is None:
+        windows = await availability_windows(session, equipment_id, start, end)
+        body = "[" + ",".join(
+            AvailabilityWindowOut(start_ts=s, end_ts=e).model_dump_json() for s, e in windows
+        ) + "]"
+        await availability_cache.set(key, body, group=group)
+    return Response(content=body, media_type="application/json")
+
+
+# -----------------------------
+# Concrete windows
+# -----------------------------
+@router.get("/{equipment_id}", response_model=list[AvailabilityOut])
+async def list_availability(
+    equipment_id: UUID,
+    start: datetime | None = Query(None, description="Only windows ending after this"),
+    end: datetime | None = Query(None, description="Only windows starting before this"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER", "FARMER"))
+):
+    q = select(Availability).where(Availability.equipment_id == equipment_id)
+    if start:
+        q = q.where(Availability.end_ts > start)
+    if end:
+        q = q.where(Availability.start_ts < end)
+    res = await session.execute(q.order_by(Availability.start_ts))
+    return list(res.scalars())
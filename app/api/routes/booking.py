@@ -1,15 +1,50 @@
 # app/api/routes/booking.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
-from math import ceil
+from datetime import datetime
+from typing import Optional
 
 from app.db.session import get_session
 from app.db.models.booking import Booking, BookingStatus
 from app.db.models.equipment import Equipment
-from app.schemas.booking import BookingCreate, BookingOut
+from app.schemas.booking import (
+    BookingCreate,
+    BookingOut,
+    BookingPage,
+    BookingBulkStatusUpdate,
+    BookingBulkStatusResult,
+    BookingConflictCheck,
+    BookingQuoteRequest,
+    BookingQuote,
+    SlotHoldCreate,
+    SlotHoldOut,
+)
+from app.services.availability import find_booking_conflicts, is_booking_overlap
+from app.services.calendar import invalidate_calendars
+from app.services.booking import (
+    OWNER_TRANSITIONS,
+    booking_list_collection,
+    bulk_owner_transition,
+    commit_transition,
+    list_user_bookings_page,
+    touch_booking_lists,
+    transition,
+)
+from app.services.earnings import record_completed_bookings
+from app.services.pricing import fetch_rates, price_booking, quote_many
+from app.services.slot_holds import acquire_hold, ensure_not_held, hold_owner, release_hold
 from app.core.security import get_current_user
+from app.core.idempotency import run_idempotent
+from app.core.etag import (
+    collection_version,
+    make_etag,
+    etag_matches,
+    cache_headers,
+    PRIVATE_CACHE_CONTROL,
+)
 from app.core.authz import (
     require_farmer,
     require_owner,
@@ -22,9 +57,21 @@ router = APIRouter(prefix="/bookings", tags=["bookings"])
 @router.post("/", response_model=BookingOut)
 async def create_booking(
     payload: BookingCreate,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     user=Depends(require_farmer),
 ):
+    """Create a PENDING booking. Send an Idempotency-Key header to make retries safe."""
+    return await run_idempotent(
+        request,
+        f"bookings:create:{user.id}",
+        payload,
+        BookingOut,
+        lambda: _create_booking(payload, session, user),
+    )
+
+
+async def _create_booking(payload: BookingCreate, session: AsyncSession, user) -> Booking:
     # Ensure equipment exists
     res = await session.execute(
         select(Equipment).where(Equipment.id == payload.equipment_id)
@@ -33,23 +80,13 @@ async def create_booking(
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    # Pricing logic
-    duration = payload.end_ts - payload.start_ts
-    if duration.total_seconds() <= 0:
-        raise HTTPException(status_code=400, detail="Invalid booking duration")
-
-    days = duration.days
-    hours = duration.seconds // 3600
+    try:
+        price = price_booking(equipment.daily_rate, equipment.hourly_rate, payload.start_ts, payload.end_ts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if days >= 1:
-        price_total = equipment.daily_rate * ceil(days)
-    elif equipment.hourly_rate:
-        price_total = equipment.hourly_rate * max(hours, 1)
-    else:
-        price_total = equipment.daily_rate
-
-    commission_fee = round(price_total * 0.10)
-    owner_payout = price_total - commission_fee
+    # Someone else mid-checkout on these days → fail before touching the DB
+    await ensure_not_held(user.id, payload.equipment_id, payload.start_ts, payload.end_ts, payload.hold_token)
 
     booking = Booking(
         equipment_id=payload.equipment_id,
@@ -57,16 +94,154 @@ async def create_booking(
         start_ts=payload.start_ts,
         end_ts=payload.end_ts,
         status=BookingStatus.PENDING,
-        price_total=price_total,
-        commission_fee=commission_fee,
-        owner_payout=owner_payout,
+        price_total=price["price_total"],
+        commission_fee=price["commission_fee"],
+        owner_payout=price["owner_payout"],
     )
     session.add(booking)
-    await session.commit()
+    try:
+        await session.commit()
+    except IntegrityError as e:
+        # ex_bookings_equipment_period: concurrent requests for one slot, exactly one wins
+        await session.rollback()
+        if is_booking_overlap(e):
+            raise HTTPException(status_code=409, detail="Equipment already booked for this period")
+        raise
     await session.refresh(booking)
+    if payload.hold_token:
+        await release_hold(payload.hold_token)
+    await touch_booking_lists(booking.renter_id, equipment.owner_id)
+    await invalidate_calendars(booking.equipment_id)
     return booking
 
 
+@router.post("/quote", response_model=list[BookingQuote])
+async def quote_bookings(
+    payload: BookingQuoteRequest,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(get_current_user),
+):
+    """
+    Price many (equipment_id, start_ts, end_ts) tuples without booking.
+    Rates are fetched in one query; results come back in request order.
+    """
+    items = [(i.equipment_id, i.start_ts, i.end_ts) for i in payload.items]
+    rates = await fetch_rates(session, (i[0] for i in items))
+    return quote_many(rates, items)
+
+
+@router.post("/holds", response_model=SlotHoldOut)
+async def hold_slot(
+    payload: SlotHoldCreate,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_farmer),
+):
+    """
+    Reserve a machine's days for a few minutes while the farmer checks out.
+    Fails fast with 409 if the slot is already booked or held by someone else.
+    """
+    if await find_booking_conflicts(session, payload.equipment_id, payload.start_ts, payload.end_ts, limit=1):
+        raise HTTPException(status_code=409, detail="Equipment already booked for this period")
+
+    hold = await acquire_hold(user.id, payload.equipment_id, payload.start_ts, payload.end_ts)
+    if hold is None:
+        raise HTTPException(status_code=503, detail="Slot holds are unavailable; create the booking directly")
+    return hold
+
+
+@router.delete("/holds/{token}")
+async def release_slot_hold(
+    token: str,
+    user=Depends(require_farmer),
+):
+    """Give up a hold before it expires (e.g. checkout abandoned)."""
+    owner = await hold_owner(token)
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Hold not found or expired")
+    if owner != str(user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    await release_hold(token)
+    return {"message": "Hold released"}
+
+
+@router.get("/conflicts", response_model=BookingConflictCheck)
+async def check_booking_conflicts(
+    equipment_id: UUID = Query(...),
+    start_ts: datetime = Query(..., description="Start of the wanted period (ISO 8601)"),
+    end_ts: datetime = Query(..., description="End of the wanted period (ISO 8601)"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(get_current_user),
+):
+    """
+    Pre-check before creating a booking: active bookings overlapping the
+    period. Advisory only – the exclusion constraint decides on create.
+    """
+    if end_ts <= start_ts:
+        raise HTTPException(status_code=400, detail="end_ts must be after start_ts")
+
+    conflicts = await find_booking_conflicts(session, equipment_id, start_ts, end_ts)
+    return {
+        "equipment_id": equipment_id,
+        "start_ts": start_ts,
+        "end_ts": end_ts,
+        "available": not conflicts,
+        "conflicts": conflicts,
+    }
+
+
+@router.get("/my", response_model=BookingPage)
+async def list_my_bookings(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status: Optional[BookingStatus] = Query(None),
+    from_ts: Optional[datetime] = Query(None, description="Only bookings ending after this instant"),
+    to_ts: Optional[datetime] = Query(None, description="Only bookings starting before this instant"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(get_current_user),
+):
+    """The caller's bookings (as renter, or on their machines as owner), newest first."""
+    if from_ts and to_ts and to_ts <= from_ts:
+        raise HTTPException(status_code=400, detail="to_ts must be after from_ts")
+
+    # Conditional GET: answered from the user's version counter, before the query
+    collection = booking_list_collection(user.id)
+    version = await collection_version(collection)
+    etag = make_etag(collection, version, request.url.query) if version else None
+    headers = cache_headers(etag, PRIVATE_CACHE_CONTROL)
+    if etag and etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    return await list_user_bookings_page(
+        session,
+        user.id,
+        as_owner=user.role != "FARMER",
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        from_ts=from_ts,
+        to_ts=to_ts,
+    )
+
+
+@router.patch("/bulk", response_model=BookingBulkStatusResult)
+async def bulk_update_booking_status(
+    payload: BookingBulkStatusUpdate,
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_owner),
+):
+    """
+    Accept, reject or complete many bookings on the owner's machines at once.
+    Each id is reported as updated or rejected (with the reason).
+    """
+    target = BookingStatus(payload.status.value)
+    if target not in OWNER_TRANSITIONS:
+        raise HTTPException(status_code=400, detail="status must be ACCEPTED, REJECTED or COMPLETED")
+    return await bulk_owner_transition(session, user.id, payload.ids, target)
+
+
 @router.get("/{booking_id}", response_model=BookingOut)
 async def get_booking(
     booking: Booking = Depends(enforce_booking_access),
@@ -88,9 +263,11 @@ async def accept_booking(
     if not eq or eq.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    booking.status = BookingStatus.ACCEPTED
-    await session.commit()
+    transition(booking, BookingStatus.ACCEPTED)
+    await commit_transition(session)
     await session.refresh(booking)
+    await touch_booking_lists(booking.renter_id, eq.owner_id)
+    await invalidate_calendars(booking.equipment_id)
     return booking
 
 
@@ -108,9 +285,11 @@ async def reject_booking(
     if not eq or eq.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    booking.status = BookingStatus.REJECTED
-    await session.commit()
+    transition(booking, BookingStatus.REJECTED)
+    await commit_transition(session)
     await session.refresh(booking)
+    await touch_booking_lists(booking.renter_id, eq.owner_id)
+    await invalidate_calendars(booking.equipment_id)
     return booking
 
 
@@ -119,9 +298,12 @@ async def cancel_booking(
     booking: Booking = Depends(enforce_booking_access),
     session: AsyncSession = Depends(get_session),
 ):
-    booking.status = BookingStatus.CANCELLED
-    await session.commit()
+    transition(booking, BookingStatus.CANCELLED)
+    await commit_transition(session)
     await session.refresh(booking)
+    eq = await session.get(Equipment, booking.equipment_id)
+    await touch_booking_lists(booking.renter_id, eq.owner_id if eq else None)
+    await invalidate_calendars(booking.equipment_id)
     return booking
 
 
@@ -139,25 +321,9 @@ async def complete_booking(
     if not eq or eq.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    if booking.status != BookingStatus.ACCEPTED:
-        raise HTTPException(status_code=400, detail="Booking must be ACCEPTED before completing")
-
-    booking.status = BookingStatus.COMPLETED
-    await session.commit()
+    transition(booking, BookingStatus.COMPLETED)
+    await commit_transition(session, lambda: record_completed_bookings(session, [(eq.owner_id, booking)]))
     await session.refresh(booking)
+    await touch_booking_lists(booking.renter_id, eq.owner_id)
+    await invalidate_calendars(booking.equipment_id)
     return booking
-
-
-@router.get("/my", response_model=list[BookingOut])
-async def list_my_bookings(
-    session: AsyncSession = Depends(get_session),
-    user=Depends(get_current_user),
-):
-    q = select(Booking)
-    if user.role == "FARMER":
-        q = q.where(Booking.renter_id == user.id)
-    else:
-        q = q.join(Equipment).where(Equipment.owner_id == user.id)
-
-    res = await session.execute(q)
-    return list(res.scalars())
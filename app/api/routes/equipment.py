@@ -1,14 +1,61 @@
 # app/api/routes/equipment.py
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 
 from app.db.session import get_session
 from app.db.models.equipment import Equipment, EquipmentStatus
-from app.schemas.equipment import EquipmentCreate, EquipmentOut
+from app.schemas.equipment import (
+    EquipmentType,
+    EquipmentCreate,
+    EquipmentOut,
+    EquipmentListingOut,
+    EquipmentPage,
+    EquipmentNearbyOut,
+    EquipmentAvailableOut,
+    EquipmentPin,
+    EquipmentSuggestion,
+    EquipmentCalendar,
+    BulkImportReport,
+)
+from app.services.equipment import (
+    list_approved_equipment_page,
+    EquipmentSort,
+    MAX_PAGE_SIZE,
+    equipment_cache,
+    LISTINGS_GROUP,
+    listing_cache_key,
+    detail_cache_key,
+    invalidate_equipment,
+    EQUIPMENT_LIST_COLLECTION,
+    equipment_item_collection,
+)
+from app.core.etag import (
+    collection_version,
+    make_etag,
+    etag_matches,
+    cache_headers,
+    CATALOGUE_CACHE_CONTROL,
+)
+from app.services.availability import find_free_equipment
+from app.services.calendar import (
+    build_month_calendar,
+    calendar_cache,
+    calendar_cache_key,
+    calendar_group,
+    invalidate_calendars,
+    normalize_month,
+)
+from app.services.fleet_import import MAX_BODY_BYTES, import_fleet, iter_lines, iter_csv_rows, iter_ndjson_rows
+from app.services.geo import find_nearby_equipment, find_equipment_pins_in_bbox
+from app.services.geo_index import equipment_index
+from app.services.suggest import suggest_index
 from app.core.authz import require_owner, enforce_equipment_ownership
+from app.utils.jwt import require_role
 from app.db.models.user import User
 
 router = APIRouter(prefix="", tags=["equipment"])
@@ -31,35 +78,245 @@ async def create_equipment(
     session.add(eq)
     await session.commit()
     await session.refresh(eq)
+    await invalidate_equipment(eq.id)
     return eq
 
 
-@router.get("/", response_model=List[EquipmentOut])
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_import_equipment(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(require_owner),
+):
+    """
+    OWNER imports a fleet in one request (all rows become drafts).
+    Body is NDJSON (application/x-ndjson) or CSV with a header row (text/csv).
+    Returns a per-row report; invalid rows don't block valid ones.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Body exceeds {MAX_BODY_BYTES} bytes")
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    lines = iter_lines(request.stream())
+    if content_type in ("text/csv", "application/csv"):
+        rows = iter_csv_rows(lines)
+    elif content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        rows = iter_ndjson_rows(lines)
+    else:
+        raise HTTPException(status_code=415, detail="Use text/csv or application/x-ndjson")
+
+    return await import_fleet(session, user.id, rows)
+
+
+@router.get("/", response_model=EquipmentPage)
 async def list_equipment(
+    request: Request,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: EquipmentSort = Query(EquipmentSort.NEWEST),
+    type_: Optional[EquipmentType] = Query(None, alias="type"),
+    operator_included: Optional[bool] = Query(None),
+    min_rate: Optional[int] = Query(None, ge=0),
+    max_rate: Optional[int] = Query(None, ge=0),
+    q: Optional[str] = Query(None, max_length=100, description="Brand / model search, e.g. 'mahindra 575'"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List approved equipment for borrowers, one page at a time.
+    Supports brand/model search and type / operator / daily-rate filters;
+    facet counts come with the first page.
+    """
+    if min_rate is not None and max_rate is not None and min_rate > max_rate:
+        raise HTTPException(status_code=400, detail="min_rate must not exceed max_rate")
+
+    key = listing_cache_key(
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        type=type_,
+        operator_included=operator_included,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        q=" ".join(q.split()).lower() if q else None,
+    )
+
+    # Conditional GET: answered from the version counter, before any query
+    version = await collection_version(EQUIPMENT_LIST_COLLECTION)
+    etag = make_etag(EQUIPMENT_LIST_COLLECTION, version, key) if version else None
+    headers = cache_headers(etag, CATALOGUE_CACHE_CONTROL)
+    if etag and etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Versioned key: a stale local-tier body can never be served under a newer ETag
+    if version:
+        key = f"{key}&v={version}"
+    body = await equipment_cache.get(key, group=LISTINGS_GROUP)
+    if body is None:
+        page = await list_approved_equipment_page(
+            session,
+            limit,
+            cursor,
+            sort=sort,
+            type_=type_,
+            operator_included=operator_included,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            q=q,
+        )
+        body = EquipmentPage.model_validate(page).model_dump_json()
+        await equipment_cache.set(key, body, group=LISTINGS_GROUP)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/suggest", response_model=List[EquipmentSuggestion])
+async def suggest_equipment(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """
+    Brand / model autocomplete, served from memory (no database hit).
+    """
+    return suggest_index.suggest(q, limit)
+
+
+@router.get("/nearby", response_model=List[EquipmentNearbyOut])
+async def list_nearby_equipment(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Approved equipment within radius_km of (lat, lon), nearest first.
+    """
+    return await find_nearby_equipment(session, lat, lon, radius_km, limit)
+
+
+@router.get("/available", response_model=List[EquipmentAvailableOut])
+async def list_available_equipment(
+    start: datetime = Query(..., description="Start of the wanted window (ISO 8601)"),
+    end: datetime = Query(..., description="End of the wanted window (ISO 8601)"),
+    type_: Optional[EquipmentType] = Query(None, alias="type"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=200),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    List all approved equipment for borrowers.
+    Approved equipment free for the whole window: covered by an availability
+    window and not overlapped by any PENDING/ACCEPTED booking.
     """
-    result = await session.execute(
-        select(Equipment).where(Equipment.status == EquipmentStatus.APPROVED)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    geo = (lat, lon, radius_km)
+    if any(v is not None for v in geo) and not all(v is not None for v in geo):
+        raise HTTPException(status_code=400, detail="lat, lon and radius_km must be given together")
+
+    return await find_free_equipment(
+        session,
+        start,
+        end,
+        type_=type_,
+        lat=lat,
+        lon=lon,
+        radius_km=radius_km,
+        limit=limit,
     )
-    equipments = result.scalars().all()
-    return equipments
 
 
-@router.get("/{equipment_id}", response_model=EquipmentOut)
+@router.get("/pins", response_model=List[EquipmentPin])
+async def list_equipment_pins(
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=2000),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Map markers inside a viewport, served from the in-memory geo index.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat must not exceed max_lat")
+    if equipment_index.loaded:
+        return equipment_index.query_bbox(min_lat, max_lat, min_lon, max_lon, limit)
+    return await find_equipment_pins_in_bbox(session, min_lat, max_lat, min_lon, max_lon, limit)
+
+
+@router.get("/pins/nearby", response_model=List[EquipmentPin])
+async def list_nearby_equipment_pins(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Map markers within radius_km of (lat, lon), nearest first, served from the in-memory geo index.
+    """
+    if equipment_index.loaded:
+        return equipment_index.query_radius(lat, lon, radius_km, limit)
+    return await find_nearby_equipment(session, lat, lon, radius_km, limit)
+
+
+@router.get("/{equipment_id}", response_model=EquipmentListingOut)
 async def get_equipment(
     equipment_id: uuid.UUID,
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     """
     Get a single equipment by ID.
     """
-    eq = await session.get(Equipment, equipment_id)
-    if not eq:
-        raise HTTPException(status_code=404, detail="Equipment not found")
-    return eq
+    collection = equipment_item_collection(equipment_id)
+    # Read-only: ids that don't exist must not create version keys
+    version = await collection_version(collection, seed=False)
+    etag = make_etag(collection, version) if version else None
+    headers = cache_headers(etag, CATALOGUE_CACHE_CONTROL)
+    if etag and etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    key = detail_cache_key(equipment_id)
+    if version:
+        key = f"{key}:v={version}"
+    body = await equipment_cache.get(key)
+    if body is None:
+        eq = await session.get(Equipment, equipment_id, options=[selectinload(Equipment.photos)])
+        if not eq:
+            raise HTTPException(status_code=404, detail="Equipment not found")
+        body = EquipmentListingOut.model_validate(eq).model_dump_json()
+        await equipment_cache.set(key, body)
+        if version is None:
+            # Row exists: seed its counter so the next request gets an ETag
+            await collection_version(collection)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{equipment_id}/calendar", response_model=EquipmentCalendar)
+async def get_equipment_calendar(
+    equipment_id: uuid.UUID,
+    month: str = Query(..., description="YYYY-MM (UTC)"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER", "FARMER")),
+):
+    """
+    Month view for one machine: availability windows and bookings merged
+    into occupancy runs, plus per-day hour totals. Cached per (machine, month).
+    Signed-in owners and farmers only, like the availability reads it merges.
+    """
+    month = normalize_month(month)
+    key = calendar_cache_key(equipment_id, month)
+    group = calendar_group(equipment_id)
+    body = await calendar_cache.get(key, group=group)
+    if body is None:
+        if not await session.get(Equipment, equipment_id):
+            raise HTTPException(status_code=404, detail="Equipment not found")
+        calendar = await build_month_calendar(session, equipment_id, month)
+        body = EquipmentCalendar.model_validate(calendar).model_dump_json()
+        await calendar_cache.set(key, body, group=group)
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/{equipment_id}", response_model=EquipmentOut)
@@ -73,6 +330,7 @@ async def update_equipment(
     OWNER updates only their own equipment listing.
     If an approved listing is edited, its status goes back to pending review.
     """
+    was_listed = eq.status == EquipmentStatus.APPROVED
     for field, value in payload.model_dump().items():
         setattr(eq, field, value)
 
@@ -81,6 +339,9 @@ async def update_equipment(
 
     await session.commit()
     await session.refresh(eq)
+    equipment_index.sync(eq)
+    suggest_index.sync(eq)
+    await invalidate_equipment(eq.id, listings=was_listed)
     return eq
 
 
@@ -102,4 +363,8 @@ async def delete_equipment(
 
     await session.delete(eq)
     await session.commit()
+    equipment_index.remove(equipment_id)
+    suggest_index.remove(equipment_id)
+    await invalidate_equipment(equipment_id)
+    await invalidate_calendars(equipment_id)
     return {"message": "Equipment deleted successfully"}
@@ -1,6 +1,6 @@
  
 # app/api/routes/payment.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
@@ -8,7 +8,12 @@ from uuid import UUID
 from app.db.session import get_session
 from app.db.models.payment import Payment, PaymentStatus
 from app.db.models.booking import Booking, BookingStatus
-from app.schemas.payment import PaymentIntentCreate, PaymentIntentOut
+from app.db.models.equipment import Equipment
+from app.schemas.payment import PaymentIntentCreate, PaymentIntentOut, OwnerEarningsSummary
+from app.services.booking import commit_transition, touch_booking_lists, transition
+from app.services.calendar import invalidate_calendars, parse_month
+from app.services.earnings import list_owner_earnings, record_completed_bookings
+from app.core.idempotency import run_idempotent
 from app.utils.jwt import require_role
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -17,9 +22,21 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 @router.post("/intent", response_model=PaymentIntentOut)
 async def create_payment_intent(
     payload: PaymentIntentCreate,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     user=Depends(require_role("FARMER", "OWNER"))
 ):
+    """Create a payment intent. Send an Idempotency-Key header to make retries safe."""
+    return await run_idempotent(
+        request,
+        f"payments:intent:{user.id}",
+        payload,
+        PaymentIntentOut,
+        lambda: _create_payment_intent(payload, session),
+    )
+
+
+async def _create_payment_intent(payload: PaymentIntentCreate, session: AsyncSession) -> Payment:
     # Booking must exist
     booking = await session.get(Booking, payload.booking_id)
     if not booking:
@@ -35,6 +52,29 @@ async def create_payment_intent(
     return payment
 
 
+@router.get("/earnings", response_model=OwnerEarningsSummary)
+async def get_owner_earnings(
+    from_month: str | None = Query(None, description="YYYY-MM, inclusive"),
+    to_month: str | None = Query(None, description="YYYY-MM, inclusive"),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(require_role("OWNER"))
+):
+    """Monthly earnings, commission and completed bookings for the calling owner."""
+    months = await list_owner_earnings(
+        session,
+        user.id,
+        from_month=parse_month(from_month)[0].date() if from_month else None,
+        to_month=parse_month(to_month)[0].date() if to_month else None,
+    )
+    return {
+        "months": months,
+        **{
+            name: sum(getattr(m, name) for m in months)
+            for name in ("completed_bookings", "gross", "commission", "earnings")
+        },
+    }
+
+
 @router.post("/{payment_id}/confirm", response_model=PaymentIntentOut)
 async def confirm_payment(
     payment_id: UUID,
@@ -48,11 +88,19 @@ async def confirm_payment(
     # For now, always succeed
     payment.status = PaymentStatus.PAID
 
-    # Also mark booking as COMPLETED
+    # Also mark booking as COMPLETED (only an ACCEPTED booking can complete)
     booking = await session.get(Booking, payment.booking_id)
+    eq = None
+    completed = []
     if booking:
-        booking.status = BookingStatus.COMPLETED
+        transition(booking, BookingStatus.COMPLETED)
+        eq = await session.get(Equipment, booking.equipment_id)
+        if eq:
+            completed.append((eq.owner_id, booking))
 
-    await session.commit()
+    await commit_transition(session, lambda: record_completed_bookings(session, completed))
     await session.refresh(payment)
+    if booking:
+        await touch_booking_lists(booking.renter_id, eq.owner_id if eq else None)
+        await invalidate_calendars(booking.equipment_id)
     return payment
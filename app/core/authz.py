@@ -1,6 +1,6 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.security import get_current_user, require_owner
+from app.core.security import get_current_user, require_farmer, require_owner
 from app.db.models.user import User, UserRole
 from app.db.models.equipment import Equipment
 from app.db.models.booking import Booking
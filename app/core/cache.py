@@ -0,0 +1,152 @@
+"""
+app/core/cache.py
+
+Two-tier response cache: in-process LRU (short TTL) in front of Redis.
+
+⚠️ NOTE:
+- Values are serialized response bodies (str); callers own the encoding.
+- If Redis is missing or erroring, the cache degrades to local-only
+  (fail-open), same as rate limiting.
+- The local tier is per worker. Invalidation clears the local tier of the
+  worker that handled the write and the shared Redis tier; other workers
+  see the change once their local entry's TTL expires.
+"""
+
+import time
+from collections import OrderedDict
+
+from redis.exceptions import RedisError
+
+from app.core.logging import logger
+from app.core.redis import redis_client
+
+
+class TwoTierCache:
+    def __init__(
+        self,
+        namespace: str,
+        local_ttl: float = 5,
+        remote_ttl: int = 300,
+        max_entries: int = 1024,
+    ):
+        self.namespace = namespace
+        self.local_ttl = local_ttl
+        self.remote_ttl = remote_ttl
+        self.max_entries = max_entries
+
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._key_group: dict[str, str] = {}
+        self._groups: dict[str, set[str]] = {}
+
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    # ---------- key helpers ----------
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def _redis_group_key(self, group: str) -> str:
+        return f"cache:{self.namespace}:group:{group}"
+
+    # ---------- local tier ----------
+    def _local_get(self, key: str) -> str | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local_drop(key)
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value: str, group: str | None) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        if group:
+            self._key_group[key] = group
+            self._groups.setdefault(group, set()).add(key)
+        while len(self._local) > self.max_entries:
+            oldest = next(iter(self._local))
+            self._local_drop(oldest)
+
+    def _local_drop(self, key: str) -> None:
+        self._local.pop(key, None)
+        group = self._key_group.pop(key, None)
+        if group and group in self._groups:
+            self._groups[group].discard(key)
+
+    # ---------- public API ----------
+    async def get(self, key: str, group: str | None = None) -> str | None:
+        value = self._local_get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        if redis_client:
+            try:
+                value = await redis_client.get(self._redis_key(key))
+            except RedisError as e:
+                logger.error(f"Redis error in response cache: {e}")
+                value = None
+            if value is not None:
+                self.stats["redis_hits"] += 1
+                self._local_set(key, value, group)
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, group: str | None = None) -> None:
+        self._local_set(key, value, group)
+        if not redis_client:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.set(self._redis_key(key), value, ex=self.remote_ttl)
+            if group:
+                group_key = self._redis_group_key(group)
+                pipe.sadd(group_key, key)
+                pipe.expire(group_key, self.remote_ttl)
+            await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Redis error in response cache: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._local_drop(key)
+        self.stats["invalidations"] += len(keys)
+        if not redis_client or not keys:
+            return
+        try:
+            await redis_client.delete(*(self._redis_key(k) for k in keys))
+        except RedisError as e:
+            logger.error(f"Redis error in response cache: {e}")
+
+    async def delete_group(self, group: str) -> None:
+        """Drop every entry stored under a group (e.g. all listing pages)."""
+        for key in list(self._groups.pop(group, ())):
+            self._local.pop(key, None)
+            self._key_group.pop(key, None)
+        self.stats["invalidations"] += 1
+        if not redis_client:
+            return
+        try:
+            # Read + drop the member set atomically so keys added meanwhile land in a fresh set
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.smembers(self._redis_group_key(group))
+            pipe.delete(self._redis_group_key(group))
+            members, _ = await pipe.execute()
+            if members:
+                await redis_client.delete(*(self._redis_key(k) for k in members))
+        except RedisError as e:
+            logger.error(f"Redis error in response cache: {e}")
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = self.stats["local_hits"] + self.stats["redis_hits"]
+        return {
+            "namespace": self.namespace,
+            **self.stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_entries": len(self._local),
+        }
@@ -16,9 +16,35 @@ class Settings(BaseSettings):
     # ---- Redis ----
     redis_url: str = Field(..., alias="REDIS_URL")
 
+    # ---- In-process equipment geo index ----
+    equipment_index_refresh_seconds: int = Field(300, alias="EQUIPMENT_INDEX_REFRESH_SECONDS")
+
+    # ---- Booking expiry sweeper ----
+    booking_pending_ttl_hours: int = Field(48, alias="BOOKING_PENDING_TTL_HOURS")
+    booking_expiry_interval_seconds: int = Field(60, alias="BOOKING_EXPIRY_INTERVAL_SECONDS")
+    booking_expiry_batch_size: int = Field(500, alias="BOOKING_EXPIRY_BATCH_SIZE")
+
+    # ---- Idempotency-Key (bookings / payment intents) ----
+    idempotency_ttl_seconds: int = Field(24 * 3600, alias="IDEMPOTENCY_TTL_SECONDS")
+    idempotency_lock_seconds: int = Field(30, alias="IDEMPOTENCY_LOCK_SECONDS")
+
+    # ---- Checkout slot holds ----
+    slot_hold_ttl_seconds: int = Field(300, alias="SLOT_HOLD_TTL_SECONDS")
+
+    # ---- Response cache (in-process LRU + Redis) ----
+    response_cache_local_ttl_seconds: float = Field(5, alias="RESPONSE_CACHE_LOCAL_TTL_SECONDS")
+    response_cache_ttl_seconds: int = Field(300, alias="RESPONSE_CACHE_TTL_SECONDS")
+    response_cache_max_entries: int = Field(1024, alias="RESPONSE_CACHE_MAX_ENTRIES")
+
+    # ---- Principal cache (get_current_user) ----
+    principal_cache_local_ttl_seconds: float = Field(5, alias="PRINCIPAL_CACHE_LOCAL_TTL_SECONDS")
+    principal_cache_ttl_seconds: int = Field(60, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_max_entries: int = Field(4096, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+
     # ---- Security / JWT ----
     jwt_algorithm: str = Field("HS256", alias="JWT_ALGORITHM")
     jwt_secret_keys: List[str] = Field(..., alias="JWT_SECRET_KEYS")
+    jwt_token_cache_max_entries: int = Field(10000, alias="JWT_TOKEN_CACHE_MAX_ENTRIES")
 
     # ---- Twilio ----
     twilio_account_sid: str | None = Field(None, alias="TWILIO_ACCOUNT_SID")
@@ -0,0 +1,94 @@
+"""
+app/core/etag.py
+
+Strong ETags derived from per-collection version counters kept in Redis.
+
+Writers bump a collection's counter after commit; readers fetch the
+counter (one tiny Redis GET) and can answer If-None-Match with 304 before
+running the main query.
+
+⚠️ NOTE:
+- If Redis is unavailable, versions are None and callers simply skip
+  ETags (fail-open).
+- A missing counter is seeded from the clock, not 0, so a Redis flush can
+  never make an old ETag match again.
+"""
+
+import hashlib
+import time
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from app.core.logging import logger
+from app.core.redis import redis_client
+
+CATALOGUE_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+# Idle counters expire; they are re-seeded from the clock on next use
+VERSION_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _version_key(collection: str) -> str:
+    return f"etag:version:{collection}"
+
+
+async def collection_version(collection: str, seed: bool = True) -> str | None:
+    """
+    Current version of a collection, or None when Redis is unavailable.
+    seed=False only reads: a missing counter returns None instead of being
+    created (use it before the caller knows the collection exists).
+    """
+    if not redis_client:
+        return None
+    key = _version_key(collection)
+    try:
+        version = await redis_client.get(key)
+        if version is None and seed:
+            await redis_client.set(key, time.time_ns(), nx=True, ex=VERSION_TTL_SECONDS)
+            version = await redis_client.get(key)
+        return version
+    except RedisError as e:
+        logger.error(f"Redis error reading ETag version: {e}")
+        return None
+
+
+async def bump_versions(*collections: str) -> None:
+    """Invalidate outstanding ETags for the given collections (call after commit)."""
+    if not redis_client or not collections:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for collection in collections:
+            key = _version_key(collection)
+            pipe.set(key, time.time_ns(), nx=True, ex=VERSION_TTL_SECONDS)
+            pipe.incr(key)
+            pipe.expire(key, VERSION_TTL_SECONDS)
+        await pipe.execute()
+    except RedisError as e:
+        logger.error(f"Redis error bumping ETag version: {e}")
+
+
+def make_etag(collection: str, version: str, variant: str = "") -> str:
+    """Strong ETag for one representation (variant = query params etc.)."""
+    digest = hashlib.blake2b(f"{collection}|{version}|{variant}".encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidates
+
+
+def cache_headers(etag: str | None, cache_control: str) -> dict:
+    headers = {"Cache-Control": cache_control}
+    if etag:
+        headers["ETag"] = etag
+    return headers
@@ -0,0 +1,127 @@
+"""
+app/core/idempotency.py
+
+Idempotency-Key support for create endpoints (bookings, payment intents).
+
+The first response for (scope, key) is stored in Redis and replayed for
+retries without running the handler again. While the first request is
+still running, a short lock makes concurrent duplicates wait for its
+result instead of executing a second time.
+
+⚠️ NOTE:
+- Requests without the header behave exactly as before.
+- Only successful responses are stored; an HTTPException releases the key
+  so the client may retry.
+- Reusing a key with a different payload is rejected with 422.
+- If Redis is unavailable the handler simply runs (fail-open).
+"""
+
+import asyncio
+import hashlib
+import json
+import secrets
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis import redis_client
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Delay between checks while a duplicate waits for the first request
+_POLL_SECONDS = 0.1
+
+# Delete the lock only if we still own it
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _fingerprint(payload: BaseModel) -> str:
+    return hashlib.blake2b(payload.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+def _render(response_model: type[BaseModel], result) -> Response:
+    body = response_model.model_validate(result).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+
+def _replay(stored: str, fingerprint: str) -> Response:
+    record = json.loads(stored)
+    if record["fingerprint"] != fingerprint:
+        raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used with a different request")
+    return Response(
+        content=record["body"],
+        status_code=record["status"],
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+async def run_idempotent(
+    request: Request,
+    scope: str,
+    payload: BaseModel,
+    response_model: type[BaseModel],
+    handler: Callable[[], Awaitable],
+) -> Response:
+    """
+    Run handler() at most once per (scope, Idempotency-Key).
+    scope should include the caller (e.g. "bookings:create:<user id>").
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key or not redis_client:
+        return _render(response_model, await handler())
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} is too long")
+
+    fingerprint = _fingerprint(payload)
+    result_key = f"idem:{scope}:{key}"
+    lock_key = f"{result_key}:lock"
+    token = secrets.token_hex(8)
+
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.idempotency_lock_seconds
+        while True:
+            stored = await redis_client.get(result_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            if await redis_client.set(lock_key, token, nx=True, ex=settings.idempotency_lock_seconds):
+                break
+            if loop.time() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress",
+                )
+            await asyncio.sleep(_POLL_SECONDS)
+    except RedisError as e:
+        logger.error(f"Redis error in idempotency layer: {e}")
+        return _render(response_model, await handler())
+
+    try:
+        response = _render(response_model, await handler())
+        record = json.dumps({
+            "fingerprint": fingerprint,
+            "status": response.status_code,
+            "body": response.body.decode(),
+        })
+        try:
+            await redis_client.set(result_key, record, ex=settings.idempotency_ttl_seconds)
+        except RedisError as e:
+            logger.error(f"Redis error storing idempotent response: {e}")
+        return response
+    finally:
+        try:
+            await redis_client.eval(_RELEASE_LOCK, 1, lock_key, token)
+        except RedisError as e:
+            logger.error(f"Redis error releasing idempotency lock: {e}")
@@ -0,0 +1,163 @@
+"""
+app/core/jwt_keys.py
+
+JWT key ring with `kid` headers, plus an LRU of recently verified tokens.
+
+Tokens are signed with the newest secret and carry `kid` = a short
+fingerprint of that secret, so verification picks exactly one key instead
+of trying every rotated secret in turn. Verified claims are kept in a small
+LRU keyed by a digest of the token until the token's own `exp`, so a
+client's repeated requests skip HMAC verification entirely.
+
+Micro-benchmark (no settings / DB needed):
+
+    python -m app.core.jwt_keys [--keys 3] [--rounds 20000]
+
+⚠️ NOTE:
+- Tokens issued before kid headers existed are still accepted by trying
+  every key (old behaviour) until they expire.
+- A token whose kid is not in the ring (its secret was rotated out, or the
+  header is malformed) is rejected without any verification attempt.
+- The LRU only holds tokens that already verified; an entry never
+  outlives the token's exp. Removing a secret requires a restart (settings
+  are loaded once), which also clears the LRU.
+"""
+
+import argparse
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from jose import JWTError, jwt
+
+
+def key_id(secret: str) -> str:
+    """Public identifier of a secret: truncated SHA-256, safe to put in headers."""
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
+class KeyRing:
+    def __init__(self, secrets: list[str], algorithm: str):
+        if not secrets:
+            raise ValueError("At least one JWT secret is required")
+        self.algorithm = algorithm
+        self.secrets = list(secrets)
+        self.by_kid = {key_id(s): s for s in self.secrets}
+        self.primary_kid = key_id(self.secrets[0])
+
+    def encode(self, claims: dict) -> str:
+        """Sign with the newest secret and tag the header with its kid."""
+        return jwt.encode(
+            claims,
+            self.secrets[0],
+            algorithm=self.algorithm,
+            headers={"kid": self.primary_kid},
+        )
+
+    def decode(self, token: str) -> dict:
+        """Verify with the key named by `kid` (all keys for legacy tokens). Raises JWTError."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            return self.decode_any(token)
+        # A non-string kid (list, object) is unhashable: reject it like any unknown key
+        secret = self.by_kid.get(kid) if isinstance(kid, str) else None
+        if secret is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, secret, algorithms=[self.algorithm])
+
+    def decode_any(self, token: str) -> dict:
+        """Previous behaviour: try every secret, newest first."""
+        last_err: JWTError | None = None
+        for secret in self.secrets:
+            try:
+                return jwt.decode(token, secret, algorithms=[self.algorithm])
+            except JWTError as e:
+                last_err = e
+        raise last_err
+
+
+class TokenCache:
+    """Bounded LRU: token digest -> (exp, claims)."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return dict(entry[1])
+
+    def set(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # no expiry: nothing bounds the entry, don't cache
+        key = self._digest(token)
+        self._entries[key] = (float(exp), dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+def decode_cached(ring: KeyRing, cache: TokenCache, token: str) -> dict:
+    """Claims of a valid token: LRU first, then one targeted verification. Raises JWTError."""
+    claims = cache.get(token)
+    if claims is None:
+        claims = ring.decode(token)
+        cache.set(token, claims)
+    return claims
+
+
+# -----------------------------
+# Micro-benchmark
+# -----------------------------
+def _benchmark(keys: int, rounds: int) -> None:
+    secrets = [f"benchmark-secret-{i}-{'x' * 32}" for i in range(keys)]
+    ring = KeyRing(secrets, "HS256")
+    claims = {"sub": "00000000-0000-0000-0000-000000000001", "role": "FARMER",
+              "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    # Worst case before: token signed with the oldest key, no kid
+    legacy = jwt.encode(claims, secrets[-1], algorithm="HS256")
+    current = ring.encode(claims)
+    cache = TokenCache()
+
+    def timed(label: str, fn) -> None:
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        per = (time.perf_counter() - t0) / rounds * 1e6
+        print(f"{label:<40} {per:8.1f} µs/request")
+
+    timed(f"before: try {keys} keys (oldest-key token)", lambda: ring.decode_any(legacy))
+    timed("after: kid -> one key", lambda: ring.decode(current))
+    timed("after: kid + verified-token LRU", lambda: decode_cached(ring, cache, current))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JWT verification micro-benchmark")
+    parser.add_argument("--keys", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    _benchmark(args.keys, args.rounds)
@@ -0,0 +1,95 @@
+"""
+app/core/principal.py
+
+Authenticated-user (principal) cache for get_current_user.
+
+The User row behind a token is cached as JSON in a TwoTierCache (per-worker
+LRU with a few seconds' TTL, then Redis with a short TTL), so an
+authenticated request normally needs no DB round trip – and no second
+pooled connection – before the route's own session.
+
+⚠️ NOTE:
+- Cache hits return a *transient* User built from the cached columns: safe
+  for reading id/role/profile fields, never session.add() it or assign it
+  to a relationship. Load the row in the route's session to modify it.
+- Call invalidate_principal(user_id) after committing any change to a
+  user's role or profile. Other workers may serve the old value until
+  their local TTL expires (see app/core/cache.py).
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.models.user import User, UserRole
+
+principal_cache = TwoTierCache(
+    "principal",
+    local_ttl=settings.principal_cache_local_ttl_seconds,
+    remote_ttl=settings.principal_cache_ttl_seconds,
+    max_entries=settings.principal_cache_max_entries,
+)
+
+
+def _dump(user: User) -> str:
+    return json.dumps({
+        "id": str(user.id),
+        "phone_e164": user.phone_e164,
+        "role": user.role.value,
+        "display_name": user.display_name,
+        "language": user.language,
+        "rating_avg": str(user.rating_avg) if user.rating_avg is not None else None,
+        "rating_count": user.rating_count,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    })
+
+
+def _load(raw: str) -> User:
+    data = json.loads(raw)
+    return User(
+        id=UUID(data["id"]),
+        phone_e164=data["phone_e164"],
+        role=UserRole(data["role"]),
+        display_name=data["display_name"],
+        language=data["language"],
+        rating_avg=Decimal(data["rating_avg"]) if data["rating_avg"] is not None else None,
+        rating_count=data["rating_count"],
+        created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+    )
+
+
+async def load_principal(user_id: str) -> User:
+    """User for a token's `sub`: cache first, DB (own short session) on a miss. 401 if gone."""
+    try:
+        key = str(UUID(str(user_id)))
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+
+    raw = await principal_cache.get(key)
+    if raw is not None:
+        return _load(raw)
+
+    async with AsyncSessionLocal() as session:
+        res = await session.execute(select(User).where(User.id == key))
+        user = res.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await principal_cache.set(key, _dump(user))
+    return user
+
+
+async def invalidate_principal(user_id: UUID) -> None:
+    """Drop a cached principal after its role/profile changed. Call after commit."""
+    await principal_cache.delete(str(user_id))
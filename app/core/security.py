@@ -2,16 +2,20 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
+from jose import JWTError
 
 from app.core.config import settings
-from app.db.session import AsyncSessionLocal
+from app.core.jwt_keys import KeyRing, TokenCache, decode_cached
+from app.core.principal import load_principal
 from app.db.models.user import User, UserRole
 
 # OAuth2 token URL (matches auth router)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/otp/verify")
 
+# Newest secret signs; kid header selects the verifying secret
+key_ring = KeyRing(settings.all_secret_keys, settings.jwt_algorithm)
+token_cache = TokenCache(settings.jwt_token_cache_max_entries)
+
 
 # -------------------------------
 # JWT utils
@@ -23,46 +27,27 @@ def create_access_token(data: dict, expires_delta: int | None = None) -> str:
         minutes=expires_delta or settings.access_token_exp_minutes
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(
-        to_encode,
-        settings.primary_secret_key,
-        algorithm=settings.jwt_algorithm,
-    )
+    return key_ring.encode(to_encode)
 
 
-def _decode_with_rotation(token: str) -> dict:
-    """Try decoding against all configured secrets (for key rotation)."""
-    last_err: Exception | None = None
-    for key in settings.all_secret_keys:
-        try:
-            return jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
-        except JWTError as e:
-            last_err = e
-            continue
-    raise HTTPException(status_code=401, detail="Invalid or expired token") from last_err
+def decode_token(token: str) -> dict:
+    """Verify a JWT (verified-token LRU, else the key named by its kid)."""
+    try:
+        return decode_cached(key_ring, token_cache, token)
+    except JWTError as e:
+        raise HTTPException(status_code=401, detail="Invalid or expired token") from e
 
 
 # -------------------------------
 # User dependencies
 # -------------------------------
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    """Decode JWT and load the User from DB."""
-    payload = _decode_with_rotation(token)
+    """Decode JWT and load the User (principal cache, DB on a miss)."""
+    payload = decode_token(token)
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
-
-    async with AsyncSessionLocal() as session:
-        res = await session.execute(select(User).where(User.id == user_id))
-        user = res.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user
+    return await load_principal(user_id)
 
 
 def require_role(*allowed_roles: UserRole):
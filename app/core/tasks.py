@@ -0,0 +1,20 @@
+"""
+app/core/tasks.py
+
+Small helpers for in-process background jobs started from app startup.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from app.core.logging import logger
+
+
+async def run_periodically(interval_seconds: float, job: Callable[[], Awaitable], name: str) -> None:
+    """Run `job` every interval_seconds forever; failures are logged, never fatal."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}")
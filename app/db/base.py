@@ -3,9 +3,10 @@ from app.db.base_class import Base
 from app.db.models.user import User
 from app.db.models.equipment import Equipment
 from app.db.models.booking import Booking
-from app.db.models.availability import Availability
+from app.db.models.availability import Availability, AvailabilityRule
 from app.db.models.payment import Payment
 from app.db.models.rating import Rating
 from app.db.models.misc import Misc
 from app.db.models.admin import Admin
 from app.db.models.audit_log import AuditLog   # ✅ correct import
+from app.db.models.owner_earnings import OwnerMonthlyEarnings
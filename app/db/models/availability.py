@@ -1,7 +1,7 @@
 # app/db/models/availability.py
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, SmallInteger, String, Time, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -35,3 +35,44 @@ class Availability(Base):
     __table_args__ = (
         Index("ix_availability_start_end", "equipment_id", "start_ts", "end_ts"),
     )
+
+
+class AvailabilityRule(Base):
+    """
+    Recurring weekly availability ("Mon–Sat 06:00–18:00 from June to October").
+    Stored once and expanded into concrete windows only for the range being
+    queried (app/services/availability_rules.py).
+    """
+    __tablename__ = "availability_rules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    equipment_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("equipment.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Bit i set = open on weekday i (0 = Monday … 6 = Sunday)
+    weekdays = Column(SmallInteger, nullable=False)
+    # Local wall-clock times in `timezone`; end <= start means the window ends next day
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    timezone = Column(String, nullable=False, server_default="Asia/Kolkata")
+
+    valid_from = Column(Date, nullable=False)
+    valid_until = Column(Date, nullable=True)  # inclusive; NULL = open-ended
+    # Days (local dates) the rule does not apply
+    exceptions = Column(ARRAY(Date), nullable=False, server_default="{}")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_availability_rules_equipment_validity", "equipment_id", "valid_from", "valid_until"),
+    )
@@ -1,9 +1,9 @@
 import uuid
 import enum
 from sqlalchemy import (
-    Column, Enum, Integer, ForeignKey, DateTime, func, Index
+    Column, Enum, Integer, ForeignKey, DateTime, func, Index, literal_column, text
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -40,13 +40,11 @@ class Booking(Base):
         UUID(as_uuid=True),
         ForeignKey("equipment.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
     renter_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     start_ts = Column(DateTime(timezone=True), nullable=False)
@@ -63,13 +61,28 @@ class Booking(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Optimistic concurrency: every UPDATE is "... WHERE id = :id AND version = :seen"
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Relationships
     equipment = relationship("Equipment", back_populates="bookings")
     renter = relationship("User", back_populates="bookings")
     rating = relationship("Rating", back_populates="booking", uselist=False)
     payment = relationship("Payment", back_populates="booking", uselist=False)
 
+    __mapper_args__ = {"version_id_col": version}
+
     __table_args__ = (
-        Index("ix_booking_equipment", "equipment_id"),
-        Index("ix_booking_renter", "renter_id"),
+        # Keyset pagination of booking lists (newest first) + per-machine lookups
+        Index("ix_bookings_renter_created_id", "renter_id", "created_at", "id"),
+        Index("ix_bookings_equipment_created_id", "equipment_id", "created_at", "id"),
+        Index("ix_bookings_equipment_status_start", "equipment_id", "status", "start_ts"),
+        # One active (PENDING/ACCEPTED) booking per machine per instant; needs btree_gist
+        ExcludeConstraint(
+            (equipment_id, "="),
+            (func.tstzrange(start_ts, end_ts, literal_column("'[)'")), "&&"),
+            name="ex_bookings_equipment_period",
+            using="gist",
+            where=text("status IN ('PENDING', 'ACCEPTED')"),
+        ),
     )
@@ -42,7 +42,12 @@ class Equipment(Base):
     status = Column(Enum(EquipmentStatus, name="equipment_status_enum"), default=EquipmentStatus.DRAFT, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    photos = relationship("EquipmentPhoto", back_populates="equipment", cascade="all, delete-orphan")
+    photos = relationship(
+        "EquipmentPhoto",
+        back_populates="equipment",
+        cascade="all, delete-orphan",
+        order_by=lambda: (EquipmentPhoto.position.asc().nulls_last(), EquipmentPhoto.id),
+    )
     bookings = relationship("Booking", back_populates="equipment", cascade="all, delete-orphan")
     availabilities = relationship("Availability", back_populates="equipment", cascade="all, delete-orphan")
 
@@ -51,6 +56,10 @@ class Equipment(Base):
         CheckConstraint("hourly_rate >= 0", name="check_hourly_rate_non_negative"),
         Index("ix_equipment_type_daily_rate", "type", "daily_rate"),
         Index("ix_equipment_lat_lon", "lat", "lon"),
+        Index("ix_equipment_status_created_id", "status", "created_at", "id"),
+        Index("ix_equipment_status_rate_id", "status", "daily_rate", "id"),
+        # ix_equipment_brand_model_trgm (GIN, pg_trgm) on brand || ' ' || model is
+        # created in migration 3e919091e061 – expression indexes aren't autogenerated
     )
 
 
@@ -0,0 +1,28 @@
+# app/db/models/owner_earnings.py
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base_class import Base
+
+
+class OwnerMonthlyEarnings(Base):
+    """
+    Running totals of COMPLETED bookings per owner per month (month of end_ts, UTC).
+    Maintained in the same transaction as the booking status change;
+    rebuilt from raw bookings by app.services.earnings.reconcile_owner_earnings.
+    """
+    __tablename__ = "owner_monthly_earnings"
+
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    month = Column(Date, primary_key=True)  # first day of the month
+
+    completed_bookings = Column(Integer, nullable=False, default=0)
+    gross = Column(Integer, nullable=False, default=0)           # sum(price_total)
+    commission = Column(Integer, nullable=False, default=0)      # sum(commission_fee)
+    earnings = Column(Integer, nullable=False, default=0)        # sum(owner_payout)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
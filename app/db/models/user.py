@@ -34,7 +34,7 @@ class User(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     phone_e164 = Column(String, unique=True, nullable=False)  # ✅ unique, no duplicate index
-    role = Column(Enum(UserRole, name="user_role_enum"), index=True, nullable=False)
+    role = Column(Enum(UserRole, name="user_role_enum"), nullable=False)
     display_name = Column(String, nullable=True)
     language = Column(String, nullable=True)
     rating_avg = Column(Numeric(2, 1), default=0.0)
@@ -82,7 +82,7 @@ class FarmerProfile(Base):
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     village = Column(Text, nullable=True)
-    pincode = Column(String, index=True)
+    pincode = Column(String)
 
     user = relationship("User", back_populates="farmer_profile")
 
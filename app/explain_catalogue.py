@@ -0,0 +1,130 @@
+# app/explain_catalogue.py
+"""
+Seed-and-EXPLAIN check for the catalogue filters.
+
+Seeds N synthetic equipment rows (default 100k) in one transaction, runs
+ANALYZE, then captures the exact page statement that
+list_approved_equipment_page sends for each filter scenario and prints its
+EXPLAIN ANALYZE plan plus the indexes it used. The transaction is rolled
+back at the end, so the target database is left untouched.
+
+    python -m app.explain_catalogue [--rows 100000] [--operator-share 0.15] [--scenario NAME]
+
+At 100k rows the type/rate filters are served by ix_equipment_type_daily_rate.
+The operator flag only picks ix_equipment_operator_included when it is
+selective (try --operator-share 0.01); at ~15% the planner walks the sort
+index and filters, stopping once the page is full.
+
+⚠️ NOTE:
+- Runs against DATABASE_URL; use a scratch or staging database. Nothing is
+  committed, but seeding 100k rows holds a transaction open for a while.
+"""
+
+import argparse
+import asyncio
+import re
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.equipment import EquipmentType
+from app.db.session import engine
+from app.services.equipment import EquipmentSort, list_approved_equipment_page
+
+# Skewed like a real catalogue: mostly tractors, few harvesters; a share with
+# an operator, 5% never filled in (NULL); 90% approved.
+_SEED = """
+INSERT INTO equipment (id, owner_id, type, brand, model, daily_rate, operator_included, status, created_at)
+SELECT
+    gen_random_uuid(),
+    :owner_id,
+    (CASE
+        WHEN r.t < 0.55 THEN 'TRACTOR' WHEN r.t < 0.70 THEN 'ROTAVATOR' WHEN r.t < 0.82 THEN 'SPRAYER'
+        WHEN r.t < 0.92 THEN 'PLOUGH' WHEN r.t < 0.97 THEN 'OTHER' ELSE 'HARVESTER'
+    END)::equipment_type_enum,
+    'Brand ' || (g % 40),
+    'Model ' || (g % 500),
+    500 + (random() * 19500)::int,
+    CASE WHEN r.o < :operator_share THEN true WHEN r.o < :operator_share + 0.05 THEN NULL ELSE false END,
+    (CASE WHEN r.s < 0.90 THEN 'APPROVED' ELSE 'PENDING_REVIEW' END)::equipment_status_enum,
+    now() - (g || ' minutes')::interval
+FROM generate_series(1, :rows) AS g
+CROSS JOIN LATERAL (SELECT random() AS t, random() AS o, random() AS s, g AS _) AS r
+"""
+
+# name -> list_approved_equipment_page kwargs (cursor pages skip the facet join)
+SCENARIOS = {
+    "type_rate_first_page": dict(
+        type_=EquipmentType.HARVESTER, min_rate=2000, max_rate=4000, sort=EquipmentSort.PRICE_ASC
+    ),
+    "type_rate_next_page": dict(
+        type_=EquipmentType.HARVESTER, min_rate=2000, max_rate=4000, sort=EquipmentSort.PRICE_ASC, next_page=True
+    ),
+    "operator_true": dict(operator_included=True, next_page=True),
+    "operator_true_harvester_price": dict(
+        type_=EquipmentType.HARVESTER, operator_included=True, sort=EquipmentSort.PRICE_DESC, next_page=True
+    ),
+    "operator_false_harvester": dict(type_=EquipmentType.HARVESTER, operator_included=False, next_page=True),
+}
+
+_INDEX_USE = re.compile(r"(?:Index Scan|Index Only Scan|Bitmap Index Scan)(?: Backward)? (?:using|on) (\w+)")
+
+
+async def _page_statement(session: AsyncSession, **params) -> tuple[str, tuple]:
+    """(SQL, parameters) of the page statement the listing sends for these params."""
+    next_page = params.pop("next_page", False)
+    if next_page:
+        first = await list_approved_equipment_page(session, **params)
+        params["cursor"] = first["next_cursor"]
+
+    captured: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):  # not the session's SAVEPOINTs
+            captured.append((statement, parameters))
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        await list_approved_equipment_page(session, **params)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    return captured[0]
+
+
+async def explain_catalogue(rows: int, operator_share: float = 0.15, only: str | None = None) -> None:
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            owner_id = (await conn.execute(text(
+                "INSERT INTO users (id, phone_e164, role) "
+                "VALUES (gen_random_uuid(), '+910000000000', 'OWNER') RETURNING id"
+            ))).scalar_one()
+            t0 = time.perf_counter()
+            await conn.execute(text(_SEED), {"owner_id": owner_id, "rows": rows, "operator_share": operator_share})
+            await conn.execute(text("ANALYZE equipment"))
+            print(f"seeded {rows} rows + ANALYZE in {time.perf_counter() - t0:.1f} s\n")
+
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            for name, params in SCENARIOS.items():
+                if only and name != only:
+                    continue
+                statement, parameters = await _page_statement(session, **dict(params))
+                plan = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                lines = [row[0] for row in plan]
+                used = sorted(set(_INDEX_USE.findall("\n".join(lines))))
+                print(f"=== {name}: indexes used: {', '.join(used) or 'none (seq scan)'}")
+                print("\n".join(lines), end="\n\n")
+        finally:
+            await trans.rollback()
+
+
+if __name__ == "__main__":
+    from app.db import base  # noqa: F401 – register every model before mapping
+    parser = argparse.ArgumentParser(description="Seed synthetic equipment and EXPLAIN the catalogue filters")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--operator-share", type=float, default=0.15, help="Fraction of rows with operator_included")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=None)
+    args = parser.parse_args()
+    asyncio.run(explain_catalogue(args.rows, args.operator_share, args.scenario))
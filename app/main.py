@@ -16,6 +16,10 @@ from app.api.routes.payment import router as payment_router
 from app.api.routes.ratings import router as ratings_router
 
 from app.db import base  # ensures all models are registered
+from app.services.geo_index import rebuild_equipment_index
+from app.services.suggest import rebuild_suggest_index
+from app.services.booking_expiry import expire_stale_bookings
+from app.core.tasks import run_periodically
 
 import os
 import asyncio
@@ -80,6 +84,34 @@ async def run_migrations():
     # Run migrations in background thread so startup isn’t blocked
     await loop.run_in_executor(ThreadPoolExecutor(), _upgrade)
 
+# --------------------------------------------------
+# ✅ Warm in-process equipment indexes (geo + autocomplete)
+# --------------------------------------------------
+@app.on_event("startup")
+async def load_equipment_indexes():
+    for name, rebuild in (
+        ("equipment geo index", rebuild_equipment_index),
+        ("equipment suggest index", rebuild_suggest_index),
+    ):
+        try:
+            await rebuild()
+        except Exception as e:
+            # Queries fall back (or return nothing) until the next refresh succeeds
+            logger.error(f"❌ Failed to load {name}: {e}")
+
+        asyncio.create_task(
+            run_periodically(settings.equipment_index_refresh_seconds, rebuild, f"{name} refresh")
+        )
+
+# --------------------------------------------------
+# ✅ Expire stale PENDING bookings in the background
+# --------------------------------------------------
+@app.on_event("startup")
+async def start_booking_expiry():
+    asyncio.create_task(
+        run_periodically(settings.booking_expiry_interval_seconds, expire_stale_bookings, "booking expiry")
+    )
+
 # --------------------------------------------------
 # ✅ Register routers
 # --------------------------------------------------
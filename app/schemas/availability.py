@@ -1,26 +1,112 @@
 # app/schemas/availability.py
-from pydantic import BaseModel, validator
-from datetime import datetime
+from pydantic import BaseModel, Field, validator
+from datetime import date, datetime, time
+from typing import Optional
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
 class AvailabilityCreate(BaseModel):
     equipment_id: UUID
-    start_time: datetime
-    end_time: datetime
+    start_ts: datetime
+    end_ts: datetime
 
-    @validator("end_time")
+    @validator("end_ts")
     def end_after_start(cls, v, values):
-        if "start_time" in values and v <= values["start_time"]:
-            raise ValueError("end_time must be after start_time")
+        if "start_ts" in values and v <= values["start_ts"]:
+            raise ValueError("end_ts must be after start_ts")
         return v
 
 
 class AvailabilityOut(BaseModel):
     id: UUID
     equipment_id: UUID
-    start_time: datetime
-    end_time: datetime
+    start_ts: datetime
+    end_ts: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AvailabilityRuleCreate(BaseModel):
+    equipment_id: UUID
+    weekdays: list[int]  # 0 = Monday … 6 = Sunday
+    start_time: time
+    end_time: time  # <= start_time means the window ends the next day
+    timezone: str = "Asia/Kolkata"
+    valid_from: date
+    valid_until: Optional[date] = None
+    exceptions: list[date] = []
+
+    @validator("weekdays")
+    def valid_weekdays(cls, v):
+        if not v or any(d < 0 or d > 6 for d in v):
+            raise ValueError("weekdays must be a non-empty list of 0 (Monday) … 6 (Sunday)")
+        return sorted(set(v))
+
+    @validator("end_time")
+    def end_differs_from_start(cls, v, values):
+        if "start_time" in values and v == values["start_time"]:
+            raise ValueError("end_time must differ from start_time")
+        return v
+
+    @validator("timezone")
+    def known_timezone(cls, v):
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Unknown timezone")
+        return v
+
+    @validator("valid_until")
+    def until_after_from(cls, v, values):
+        if v is not None and "valid_from" in values and v < values["valid_from"]:
+            raise ValueError("valid_until must not be before valid_from")
+        return v
+
+
+class AvailabilityRuleExceptions(BaseModel):
+    days: list[date]
+
+
+class AvailabilityRuleOut(BaseModel):
+    id: UUID
+    equipment_id: UUID
+    weekdays: list[int]
+    start_time: time
+    end_time: time
+    timezone: str
+    valid_from: date
+    valid_until: Optional[date] = None
+    exceptions: list[date]
+
+    @validator("weekdays", pre=True)
+    def mask_to_list(cls, v):
+        return [d for d in range(7) if v >> d & 1] if isinstance(v, int) else v
 
     class Config:
         from_attributes = True
+
+
+class AvailabilityWindowOut(BaseModel):
+    start_ts: datetime
+    end_ts: datetime
+
+
+class EquipmentWindowsOut(BaseModel):
+    """One NDJSON line of the multi-equipment range read."""
+    equipment_id: UUID
+    windows: list[AvailabilityWindowOut]
+
+
+class FreeSlotSearch(BaseModel):
+    equipment_ids: list[UUID] = Field(..., min_length=1)
+    start: datetime
+    end: datetime
+    min_hours: float = Field(..., gt=0, description="Minimum slot length, e.g. 48 for a 2-day slot")
+    count: int = Field(1, ge=1, description="Slots returned per machine")
+
+
+class EquipmentSlotsOut(BaseModel):
+    equipment_id: UUID
+    slots: list[AvailabilityWindowOut]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator, Field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from uuid import UUID
 
@@ -13,10 +13,20 @@ class BookingStatus(str, Enum):
     EXPIRED = "EXPIRED"
 
 
+def require_timezone(v: datetime) -> datetime:
+    """Reject naive timestamps: they can't be compared with aware ones."""
+    if v.tzinfo is None or v.utcoffset() is None:
+        raise ValueError("timestamp must include a timezone offset")
+    return v
+
+
 class BookingCreate(BaseModel):
     equipment_id: UUID
     start_ts: datetime
     end_ts: datetime
+    hold_token: str | None = Field(None, description="Token from POST /bookings/holds, if the slot was held")
+
+    _aware = validator("start_ts", "end_ts")(require_timezone)
 
     @validator("end_ts")
     def end_after_start(cls, v, values):
@@ -28,7 +38,7 @@ class BookingCreate(BaseModel):
     @validator("start_ts")
     def start_in_future(cls, v):
         """Ensure booking cannot start in the past."""
-        if v < datetime.utcnow():
+        if v < datetime.now(timezone.utc):
             raise ValueError("start_ts must be in the future")
         return v
 
@@ -60,3 +70,85 @@ class BookingOut(BaseModel):
         json_schema_extra = {
             "notes": "farmer_id is renter_id from DB, exposed for business clarity"
         }
+
+
+class BookingPage(BaseModel):
+    items: list[BookingOut]
+    next_cursor: str | None = Field(None, description="Pass back as ?cursor= to fetch the next page")
+
+
+class BookingBulkStatusUpdate(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1, max_length=200)
+    status: BookingStatus = Field(..., description="ACCEPTED, REJECTED or COMPLETED")
+
+
+class BookingBulkRejection(BaseModel):
+    id: UUID
+    reason: str
+
+
+class BookingBulkStatusResult(BaseModel):
+    updated: list[UUID]
+    rejected: list[BookingBulkRejection]
+
+
+class SlotHoldCreate(BaseModel):
+    equipment_id: UUID
+    start_ts: datetime
+    end_ts: datetime
+
+    _aware = validator("start_ts", "end_ts")(require_timezone)
+
+    @validator("end_ts")
+    def end_after_start(cls, v, values):
+        """Ensure hold end is strictly after start."""
+        if "start_ts" in values and v <= values["start_ts"]:
+            raise ValueError("end_ts must be after start_ts")
+        return v
+
+
+class SlotHoldOut(BaseModel):
+    token: str = Field(..., description="Present as hold_token when creating the booking")
+    equipment_id: UUID
+    start_ts: datetime
+    end_ts: datetime
+    expires_at: datetime
+
+
+class BookingConflict(BaseModel):
+    id: UUID
+    status: BookingStatus
+    start_ts: datetime
+    end_ts: datetime
+
+
+class BookingConflictCheck(BaseModel):
+    equipment_id: UUID
+    start_ts: datetime
+    end_ts: datetime
+    available: bool = Field(..., description="True if no PENDING/ACCEPTED booking overlaps the period")
+    conflicts: list[BookingConflict] = []
+
+
+class QuoteItem(BaseModel):
+    equipment_id: UUID
+    start_ts: datetime
+    end_ts: datetime
+
+    _aware = validator("start_ts", "end_ts")(require_timezone)
+
+
+class BookingQuoteRequest(BaseModel):
+    items: list[QuoteItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BookingQuote(BaseModel):
+    equipment_id: UUID
+    start_ts: datetime
+    end_ts: datetime
+    billed_days: int | None = None
+    billed_hours: int | None = None
+    price_total: int | None = None
+    commission_fee: int | None = None
+    owner_payout: int | None = None
+    error: str | None = Field(None, description="Set instead of prices when the item can't be quoted")
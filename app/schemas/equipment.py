@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Literal, Optional
+from datetime import date, datetime
 from enum import Enum
 from uuid import UUID
 
@@ -49,3 +50,86 @@ class EquipmentOut(EquipmentCreate):
 
     class Config:
         from_attributes = True
+
+
+class EquipmentPhotoOut(BaseModel):
+    id: UUID
+    url: str
+    position: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class EquipmentListingOut(EquipmentOut):
+    """Listing/detail shape: EquipmentOut plus photos ordered by position."""
+    photos: list[EquipmentPhotoOut] = []
+
+
+class EquipmentFacets(BaseModel):
+    total: int
+    types: dict[EquipmentType, int]
+    operator_included: dict[bool, int]
+
+
+class EquipmentPage(BaseModel):
+    items: list[EquipmentListingOut]
+    next_cursor: Optional[str] = Field(None, description="Pass back as ?cursor= to fetch the next page")
+    facets: Optional[EquipmentFacets] = Field(None, description="Only returned on the first page")
+
+
+class EquipmentNearbyOut(EquipmentListingOut):
+    distance_km: float = Field(..., ge=0, description="Great-circle distance from the query point")
+
+
+class EquipmentAvailableOut(EquipmentListingOut):
+    distance_km: Optional[float] = Field(None, ge=0, description="Only set when searching by location")
+
+
+class EquipmentPin(BaseModel):
+    """Compact map marker served from the in-memory geo index."""
+    id: UUID
+    lat: float
+    lon: float
+    daily_rate: int
+    hourly_rate: Optional[int] = None
+    distance_km: Optional[float] = None
+
+
+class EquipmentSuggestion(BaseModel):
+    text: str
+    count: int = Field(..., description="Approved listings matching this phrase")
+
+
+class BulkImportRowResult(BaseModel):
+    row: int = Field(..., description="1-based data row number in the uploaded file")
+    ok: bool
+    id: Optional[UUID] = None
+    errors: Optional[list[str]] = None
+
+
+class BulkImportReport(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkImportRowResult]
+
+
+class CalendarRun(BaseModel):
+    start: datetime
+    end: datetime
+    state: Literal["closed", "free", "pending", "booked"]
+
+
+class CalendarDay(BaseModel):
+    day: date
+    closed_hours: float
+    free_hours: float
+    pending_hours: float
+    booked_hours: float
+
+
+class EquipmentCalendar(BaseModel):
+    equipment_id: UUID
+    month: str = Field(..., description="YYYY-MM, UTC")
+    runs: list[CalendarRun] = Field(..., description="Contiguous occupancy runs covering the whole month")
+    days: list[CalendarDay]
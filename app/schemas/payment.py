@@ -2,7 +2,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 
 
 class PaymentMethod(str, Enum):
@@ -27,4 +27,22 @@ class PaymentIntentOut(BaseModel):
     method: PaymentMethod
     status: PaymentStatus
     created_at: datetime
- 
+
+
+class OwnerEarningsMonth(BaseModel):
+    month: date
+    completed_bookings: int
+    gross: int
+    commission: int
+    earnings: int
+
+    class Config:
+        from_attributes = True
+
+
+class OwnerEarningsSummary(BaseModel):
+    months: list[OwnerEarningsMonth]
+    completed_bookings: int
+    gross: int
+    commission: int
+    earnings: int
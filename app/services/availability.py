@@ -0,0 +1,184 @@
+# app/services/availability.py
+"""
+Availability queries.
+
+"Free between dates" search is a single set-based statement: an EXISTS probe
+on ix_availability_start_end for a covering window and a NOT EXISTS probe on
+bookings for any overlapping PENDING/ACCEPTED booking, evaluated per candidate
+row by Postgres instead of one round trip per machine.
+
+Booking overlap is expressed exactly like the ex_bookings_equipment_period
+exclusion constraint (equipment_id =, tstzrange &&, same partial predicate)
+so the planner can answer it from the constraint's GiST index.
+
+Recurring rules cannot be expanded in SQL, so machines without a covering
+concrete window are admitted when some rule is valid in the range and then
+checked in memory against their merged concrete + expanded rule windows.
+Candidates are read in keyset pages on the sort key until `limit` of them
+pass (or none are left), so rejected rule matches never shorten a result.
+"""
+
+from datetime import datetime
+
+from uuid import UUID
+
+from sqlalchemy import select, and_, or_, exists, func, literal_column, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.availability import Availability, AvailabilityRule
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.equipment import Equipment, EquipmentStatus
+from app.services.availability_rules import load_windows, rule_active_between
+from app.services.equipment import EQUIPMENT_OUT_COLUMNS, attach_photos
+from app.utils.intervals import covers
+from app.services.geo import bounding_box, haversine_sql
+
+# Bookings in these states hold their slot
+ACTIVE_BOOKING_STATUSES = (BookingStatus.PENDING, BookingStatus.ACCEPTED)
+
+# Rendered as literals (not bind params) so they match the exclusion constraint's
+# index expression and partial predicate in migration 5b2f0c8d9e41
+_HALF_OPEN = literal_column("'[)'")
+BOOKING_PERIOD = func.tstzrange(Booking.start_ts, Booking.end_ts, _HALF_OPEN)
+ACTIVE_BOOKING_PREDICATE = text("bookings.status IN ('PENDING', 'ACCEPTED')")
+
+# SQLSTATE exclusion_violation
+EXCLUSION_VIOLATION = "23P01"
+
+# Candidates per requested row in each page, since rule matches are post-filtered
+RULE_OVERFETCH = 3
+
+
+def period(start: datetime, end: datetime):
+    return func.tstzrange(start, end, _HALF_OPEN)
+
+
+def overlaps(start: datetime, end: datetime):
+    """Booking's [start_ts, end_ts) intersects [start, end)."""
+    return BOOKING_PERIOD.op("&&")(period(start, end))
+
+
+def is_booking_overlap(error: Exception) -> bool:
+    """True if a DB error was raised by ex_bookings_equipment_period."""
+    orig = getattr(error, "orig", error)
+    return (
+        getattr(orig, "sqlstate", None) == EXCLUSION_VIOLATION
+        or "ex_bookings_equipment_period" in str(orig)
+    )
+
+
+def covering_window_exists(start: datetime, end: datetime):
+    """Equipment has one availability window spanning [start, end)."""
+    return exists().where(
+        and_(
+            Availability.equipment_id == Equipment.id,
+            Availability.start_ts <= start,
+            Availability.end_ts >= end,
+        )
+    )
+
+
+def rule_candidate_exists(start: datetime, end: datetime):
+    """Equipment has a recurring rule valid somewhere in [start, end) (coarse, checked later)."""
+    return exists().where(
+        and_(
+            AvailabilityRule.equipment_id == Equipment.id,
+            *rule_active_between(start, end),
+        )
+    )
+
+
+def overlapping_booking_exists(start: datetime, end: datetime):
+    """Equipment has an active booking intersecting [start, end)."""
+    return exists().where(
+        and_(
+            Booking.equipment_id == Equipment.id,
+            ACTIVE_BOOKING_PREDICATE,
+            overlaps(start, end),
+        )
+    )
+
+
+async def find_booking_conflicts(
+    session: AsyncSession,
+    equipment_id: UUID,
+    start: datetime,
+    end: datetime,
+    limit: int = 20,
+) -> list[dict]:
+    """Active bookings of one machine that intersect [start, end), earliest first."""
+    q = (
+        select(Booking.id, Booking.start_ts, Booking.end_ts, Booking.status)
+        .where(
+            Booking.equipment_id == equipment_id,
+            ACTIVE_BOOKING_PREDICATE,
+            overlaps(start, end),
+        )
+        .order_by(Booking.start_ts)
+        .limit(limit)
+    )
+    res = await session.execute(q)
+    return [dict(row) for row in res.mappings()]
+
+
+async def find_free_equipment(
+    session: AsyncSession,
+    start: datetime,
+    end: datetime,
+    type_=None,
+    lat: float | None = None,
+    lon: float | None = None,
+    radius_km: float | None = None,
+    limit: int = 50,
+) -> list[dict]:
+    """
+    APPROVED equipment that is published as available for the whole of
+    [start, end) and has no active booking overlapping it.
+    Nearest first when a geo filter is given, otherwise cheapest first.
+    """
+    has_window = covering_window_exists(start, end)
+    clauses = [
+        Equipment.status == EquipmentStatus.APPROVED,
+        or_(has_window, rule_candidate_exists(start, end)),
+        ~overlapping_booking_exists(start, end),
+    ]
+    if type_ is not None:
+        clauses.append(Equipment.type == type_)
+
+    columns = list(EQUIPMENT_OUT_COLUMNS) + [has_window.label("has_window")]
+    if lat is not None and lon is not None and radius_km is not None:
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        distance = haversine_sql(lat, lon)
+        clauses += [
+            Equipment.lat.between(min_lat, max_lat),
+            Equipment.lon.between(min_lon, max_lon),
+            distance <= radius_km,
+        ]
+        columns.append(distance.label("distance_km"))
+        sort_key, sort_field = distance, "distance_km"
+    else:
+        sort_key, sort_field = Equipment.daily_rate, "daily_rate"
+
+    page_size = limit * RULE_OVERFETCH
+    q = select(*columns).where(and_(*clauses)).order_by(sort_key.asc(), Equipment.id.asc()).limit(page_size)
+    items: list[dict] = []
+    after = None
+    while len(items) < limit:
+        page = q if after is None else q.where(tuple_(sort_key, Equipment.id) > tuple_(*after))
+        res = await session.execute(page)
+        rows = [dict(row) for row in res.mappings()]
+        if not rows:
+            break
+        after = (rows[-1][sort_field], rows[-1]["id"])
+
+        # No single covering row: check concrete + expanded rule windows together
+        pending = [r["id"] for r in rows if not r["has_window"]]
+        windows = await load_windows(session, pending, start, end)
+        for row in rows:
+            if row.pop("has_window") or covers(windows[row["id"]], start, end):
+                items.append(row)
+                if len(items) == limit:
+                    break
+        if len(rows) < page_size:
+            break
+    return await attach_photos(session, items)
@@ -0,0 +1,225 @@
+# app/services/availability_rules.py
+"""
+Recurring availability rules.
+
+A rule ("Mon–Sat 06:00–18:00 local, June–October, except these days") is a
+single row. Concrete windows are produced on demand for the range being
+read – never materialized – so a season costs one row per pattern instead
+of one row per day.
+
+⚠️ NOTE:
+- Expanded + merged windows (concrete Availability rows and rules) are
+  cached per equipment and range in a TwoTierCache group per machine; call
+  invalidate_availability after any window/rule change on that machine.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.models.availability import Availability, AvailabilityRule
+from app.utils.intervals import merge_intervals
+
+# Longest range a single windows read may expand
+MAX_EXPANSION_DAYS = 92
+
+# Machines per multi-equipment range read, and rows fetched per DB round trip
+MAX_RANGE_EQUIPMENT = 200
+RANGE_STREAM_CHUNK = 1000
+
+availability_cache = TwoTierCache(
+    "availability",
+    local_ttl=settings.response_cache_local_ttl_seconds,
+    remote_ttl=settings.response_cache_ttl_seconds,
+    max_entries=settings.response_cache_max_entries,
+)
+
+
+# -----------------------------
+# Weekday mask helpers
+# -----------------------------
+def weekdays_to_mask(weekdays: Iterable[int]) -> int:
+    mask = 0
+    for d in weekdays:
+        mask |= 1 << d
+    return mask
+
+
+def mask_to_weekdays(mask: int) -> list[int]:
+    return [d for d in range(7) if mask >> d & 1]
+
+
+# -----------------------------
+# Expansion
+# -----------------------------
+def expand_rule(rule: AvailabilityRule, lo: datetime, hi: datetime) -> list[tuple[datetime, datetime]]:
+    """Concrete (UTC) windows of one rule that intersect [lo, hi)."""
+    tz = ZoneInfo(rule.timezone)
+    # Start a day early: an overnight window from the previous day may reach into lo
+    first = max(rule.valid_from, lo.astimezone(tz).date() - timedelta(days=1))
+    last = hi.astimezone(tz).date()
+    if rule.valid_until is not None:
+        last = min(last, rule.valid_until)
+    skip = set(rule.exceptions or ())
+    overnight = rule.end_time <= rule.start_time
+
+    windows = []
+    day = first
+    while day <= last:
+        if rule.weekdays >> day.weekday() & 1 and day not in skip:
+            start = datetime.combine(day, rule.start_time, tz)
+            end = datetime.combine(day + timedelta(days=1) if overnight else day, rule.end_time, tz)
+            if start < hi and end > lo:
+                windows.append((start.astimezone(timezone.utc), end.astimezone(timezone.utc)))
+        day += timedelta(days=1)
+    return windows
+
+
+def expand_rules(rules: Iterable[AvailabilityRule], lo: datetime, hi: datetime) -> list[tuple[datetime, datetime]]:
+    windows = []
+    for rule in rules:
+        windows.extend(expand_rule(rule, lo, hi))
+    return windows
+
+
+def rule_active_between(lo: datetime, hi: datetime) -> list:
+    # A day of slack on both sides for time zones / overnight windows
+    return [
+        AvailabilityRule.valid_from <= (hi + timedelta(days=1)).date(),
+        or_(
+            AvailabilityRule.valid_until.is_(None),
+            AvailabilityRule.valid_until >= (lo - timedelta(days=1)).date(),
+        ),
+    ]
+
+
+async def load_rules(
+    session: AsyncSession,
+    equipment_ids: Iterable[UUID],
+    lo: datetime,
+    hi: datetime,
+) -> dict[UUID, list[AvailabilityRule]]:
+    """Rules that may produce windows in [lo, hi), grouped by equipment – one query."""
+    ids = list(set(equipment_ids))
+    by_equipment: dict[UUID, list[AvailabilityRule]] = {i: [] for i in ids}
+    if not ids:
+        return by_equipment
+    res = await session.execute(
+        select(AvailabilityRule).where(
+            AvailabilityRule.equipment_id.in_(ids),
+            *rule_active_between(lo, hi),
+        )
+    )
+    for rule in res.scalars():
+        by_equipment[rule.equipment_id].append(rule)
+    return by_equipment
+
+
+async def load_windows(
+    session: AsyncSession,
+    equipment_ids: Iterable[UUID],
+    lo: datetime,
+    hi: datetime,
+) -> dict[UUID, list[tuple[datetime, datetime]]]:
+    """Merged windows (concrete rows + expanded rules) within [lo, hi), per equipment – two queries."""
+    ids = list(set(equipment_ids))
+    windows: dict[UUID, list] = {i: [] for i in ids}
+    if not ids:
+        return windows
+    res = await session.execute(
+        select(Availability.equipment_id, Availability.start_ts, Availability.end_ts).where(
+            Availability.equipment_id.in_(ids),
+            Availability.start_ts < hi,
+            Availability.end_ts > lo,
+        )
+    )
+    for equipment_id, start_ts, end_ts in res:
+        windows[equipment_id].append((start_ts, end_ts))
+    rules = await load_rules(session, ids, lo, hi)
+    return {
+        equipment_id: merge_intervals(found + expand_rules(rules[equipment_id], lo, hi), lo, hi)
+        for equipment_id, found in windows.items()
+    }
+
+
+async def availability_windows(
+    session: AsyncSession,
+    equipment_id: UUID,
+    lo: datetime,
+    hi: datetime,
+) -> list[tuple[datetime, datetime]]:
+    """Merged windows for one machine within [lo, hi)."""
+    return (await load_windows(session, [equipment_id], lo, hi))[equipment_id]
+
+
+async def stream_windows(
+    equipment_ids: Iterable[UUID],
+    lo: datetime,
+    hi: datetime,
+) -> AsyncIterator[tuple[UUID, list[tuple[datetime, datetime]]]]:
+    """
+    Yield (equipment_id, merged windows within [lo, hi)) for every requested
+    machine, in equipment_id order. Concrete rows come from one streamed range
+    scan ordered like ix_availability_start_end, so only one machine's windows
+    are held in memory at a time.
+
+    Opens its own session: the caller's request-scoped session is already
+    closed while a StreamingResponse is being sent.
+    """
+    ids = sorted(set(equipment_ids))
+    async with AsyncSessionLocal() as session:
+        rules = await load_rules(session, ids, lo, hi)
+        res = await session.stream(
+            select(Availability.equipment_id, Availability.start_ts, Availability.end_ts)
+            .where(
+                Availability.equipment_id.in_(ids),
+                Availability.start_ts < hi,
+                Availability.end_ts > lo,
+            )
+            .order_by(Availability.equipment_id, Availability.start_ts)
+            .execution_options(yield_per=RANGE_STREAM_CHUNK)
+        )
+
+        def group(equipment_id: UUID, found: list) -> tuple[UUID, list]:
+            return equipment_id, merge_intervals(found + expand_rules(rules[equipment_id], lo, hi), lo, hi)
+
+        pending = iter(ids)
+        current, found = None, []
+        async for equipment_id, start_ts, end_ts in res:
+            if equipment_id != current:
+                if current is not None:
+                    yield group(current, found)
+                # Machines without concrete rows in range sort before this one
+                for skipped in pending:
+                    if skipped == equipment_id:
+                        break
+                    yield group(skipped, [])
+                current, found = equipment_id, []
+            found.append((start_ts, end_ts))
+        if current is not None:
+            yield group(current, found)
+        for skipped in pending:
+            yield group(skipped, [])
+
+
+# -----------------------------
+# Cache keys / invalidation
+# -----------------------------
+def windows_cache_key(equipment_id: UUID, lo: datetime, hi: datetime) -> str:
+    return f"{equipment_id}:{lo.isoformat()}:{hi.isoformat()}"
+
+
+def availability_group(equipment_id: UUID) -> str:
+    return f"equipment:{equipment_id}"
+
+
+async def invalidate_availability(equipment_id: UUID) -> None:
+    """Drop cached windows of one machine. Call after commit."""
+    await availability_cache.delete_group(availability_group(equipment_id))
@@ -0,0 +1,220 @@
+# app/services/booking.py
+from datetime import datetime
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, tuple_, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.etag import bump_versions
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.equipment import Equipment
+from app.services.calendar import invalidate_calendars
+from app.services.earnings import record_completed_bookings
+from app.utils.pagination import encode_cursor, decode_cursor
+
+MAX_PAGE_SIZE = 100
+MAX_BULK_IDS = 200
+
+# Allowed status changes: current -> reachable statuses
+BOOKING_TRANSITIONS = {
+    BookingStatus.PENDING: {
+        BookingStatus.ACCEPTED,
+        BookingStatus.REJECTED,
+        BookingStatus.CANCELLED,
+        BookingStatus.EXPIRED,
+    },
+    BookingStatus.ACCEPTED: {BookingStatus.COMPLETED, BookingStatus.CANCELLED},
+    BookingStatus.REJECTED: set(),
+    BookingStatus.CANCELLED: set(),
+    BookingStatus.COMPLETED: set(),
+    BookingStatus.EXPIRED: set(),
+}
+
+# Status changes an owner may make: target -> allowed current statuses
+OWNER_TRANSITIONS = {
+    target: tuple(s for s, reachable in BOOKING_TRANSITIONS.items() if target in reachable)
+    for target in (BookingStatus.ACCEPTED, BookingStatus.REJECTED, BookingStatus.COMPLETED)
+}
+
+
+def booking_list_collection(user_id: UUID) -> str:
+    """ETag collection for one user's booking list (as renter or as owner)."""
+    return f"bookings:user:{user_id}"
+
+
+async def touch_booking_lists(*user_ids: UUID) -> None:
+    """Invalidate booking-list ETags of everyone who sees the changed booking. Call after commit."""
+    await bump_versions(*{booking_list_collection(u) for u in user_ids if u})
+
+
+def transition(booking: Booking, target: BookingStatus) -> None:
+    """Set a new status if the transition table allows it, else 409."""
+    if target not in BOOKING_TRANSITIONS[booking.status]:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Cannot change {booking.status.value} booking to {target.value}",
+        )
+    booking.status = target
+
+
+async def commit_transition(
+    session: AsyncSession,
+    before_commit: Callable[[], Awaitable] | None = None,
+) -> None:
+    """
+    Commit a status change. The version check in the UPDATE turns a
+    concurrent change (lost update) into a 409 instead of a silent overwrite.
+    before_commit runs after the versioned UPDATE, in the same transaction.
+    """
+    try:
+        await session.flush()
+        if before_commit:
+            await before_commit()
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail="Booking was changed by another request; reload and retry")
+
+
+def _page_filters(
+    model,
+    cursor: str | None,
+    status: BookingStatus | None,
+    from_ts: datetime | None,
+    to_ts: datetime | None,
+) -> list:
+    clauses = []
+    if status is not None:
+        clauses.append(model.status == status)
+    # Bookings whose period overlaps [from_ts, to_ts)
+    if from_ts is not None:
+        clauses.append(model.end_ts > from_ts)
+    if to_ts is not None:
+        clauses.append(model.start_ts < to_ts)
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        clauses.append(tuple_(model.created_at, model.id) < tuple_(last_created, last_id))
+    return clauses
+
+
+async def list_user_bookings_page(
+    session: AsyncSession,
+    user_id: UUID,
+    as_owner: bool,
+    limit: int = 20,
+    cursor: str | None = None,
+    status: BookingStatus | None = None,
+    from_ts: datetime | None = None,
+    to_ts: datetime | None = None,
+) -> dict:
+    """
+    One page of a user's bookings, newest first (keyset on created_at, id).
+
+    Renters walk ix_bookings_renter_created_id directly. Owners get a
+    LATERAL top-N per machine on ix_bookings_equipment_created_id, so the
+    cost is bounded by (machines x page size), not by booking history.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    if not as_owner:
+        q = (
+            select(Booking)
+            .where(Booking.renter_id == user_id, *_page_filters(Booking, cursor, status, from_ts, to_ts))
+            .order_by(Booking.created_at.desc(), Booking.id.desc())
+        )
+    else:
+        per_machine = (
+            select(Booking)
+            .where(
+                Booking.equipment_id == Equipment.id,
+                *_page_filters(Booking, cursor, status, from_ts, to_ts),
+            )
+            .order_by(Booking.created_at.desc(), Booking.id.desc())
+            .limit(limit + 1)
+            .lateral()
+        )
+        b = aliased(Booking, per_machine)
+        q = (
+            select(b)
+            .select_from(Equipment)
+            .join(per_machine, true())
+            .where(Equipment.owner_id == user_id)
+            .order_by(b.created_at.desc(), b.id.desc())
+        )
+
+    rows = list((await session.execute(q.limit(limit + 1))).scalars())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def bulk_owner_transition(
+    session: AsyncSession,
+    owner_id: UUID,
+    booking_ids: list[UUID],
+    target: BookingStatus,
+) -> dict:
+    """
+    Move many bookings to `target` in one UPDATE ... FROM equipment ... RETURNING.
+    Ownership and the allowed source statuses are checked in the WHERE clause;
+    ids that didn't match are explained by one follow-up SELECT. Commits.
+    """
+    allowed_from = OWNER_TRANSITIONS[target]
+    ids = list(dict.fromkeys(booking_ids))
+
+    res = await session.execute(
+        update(Booking)
+        .where(
+            Booking.id.in_(ids),
+            Booking.equipment_id == Equipment.id,
+            Equipment.owner_id == owner_id,
+            Booking.status.in_(allowed_from),
+        )
+        .values(status=target, version=Booking.version + 1)
+        .returning(
+            Booking.id,
+            Booking.renter_id,
+            Booking.equipment_id,
+            Booking.end_ts,
+            Booking.price_total,
+            Booking.commission_fee,
+            Booking.owner_payout,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = res.all()
+    updated = {row.id: (row.renter_id, row.equipment_id) for row in rows}
+    if target == BookingStatus.COMPLETED:
+        await record_completed_bookings(session, ((owner_id, row) for row in rows))
+    await session.commit()
+
+    rejected = []
+    missing = [i for i in ids if i not in updated]
+    if missing:
+        res = await session.execute(
+            select(Booking.id, Booking.status, Equipment.owner_id)
+            .join(Equipment, Equipment.id == Booking.equipment_id)
+            .where(Booking.id.in_(missing))
+        )
+        found = {row.id: row for row in res}
+        for booking_id in missing:
+            row = found.get(booking_id)
+            if row is None:
+                reason = "Booking not found"
+            elif row.owner_id != owner_id:
+                reason = "Not authorized"
+            else:
+                reason = f"Cannot change {row.status.value} booking to {target.value}"
+            rejected.append({"id": booking_id, "reason": reason})
+
+    if updated:
+        await touch_booking_lists(owner_id, *(renter_id for renter_id, _ in updated.values()))
+        await invalidate_calendars(*(equipment_id for _, equipment_id in updated.values()))
+    return {"updated": list(updated), "rejected": rejected}
@@ -0,0 +1,98 @@
+# app/services/booking_expiry.py
+"""
+Expiry sweeper for stale PENDING bookings.
+
+A PENDING booking expires once its start time has passed, or once it has
+gone unanswered for BOOKING_PENDING_TTL_HOURS. Expired bookings release
+their slot (the overlap constraint only covers PENDING/ACCEPTED).
+
+⚠️ NOTE:
+- Every worker runs the loop, but a Postgres advisory lock lets only one
+  of them sweep at a time; the others skip the run. The lock is released
+  even when a chunk fails (or the connection is discarded), so one bad
+  run can't block every later sweep.
+- Rows are expired in chunks of set-based UPDATE ... RETURNING statements,
+  each committed on its own, so a big backlog never holds one long
+  transaction. Rows locked by a concurrent accept/cancel are skipped and
+  picked up next run.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, or_, func
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import engine
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.equipment import Equipment
+from app.services.booking import touch_booking_lists
+from app.services.calendar import invalidate_calendars
+
+# Arbitrary app-wide key for pg_try_advisory_lock
+EXPIRY_LOCK_KEY = 0x7EC0_0013
+
+
+def _expire_chunk(now: datetime, deadline: datetime, batch_size: int):
+    stale_ids = (
+        select(Booking.id)
+        .where(
+            Booking.status == BookingStatus.PENDING,
+            or_(Booking.start_ts <= now, Booking.created_at <= deadline),
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(Booking)
+        .where(
+            Booking.id.in_(stale_ids),
+            Booking.status == BookingStatus.PENDING,
+            Equipment.id == Booking.equipment_id,
+        )
+        .values(status=BookingStatus.EXPIRED, version=Booking.version + 1)
+        .returning(Booking.renter_id, Equipment.owner_id, Booking.equipment_id)
+    )
+
+
+async def expire_stale_bookings(batch_size: int | None = None) -> int:
+    """Expire stale PENDING bookings. Returns the number expired (0 if another worker is sweeping)."""
+    batch_size = batch_size or settings.booking_expiry_batch_size
+    now = datetime.now(timezone.utc)
+    deadline = now - timedelta(hours=settings.booking_pending_ttl_hours)
+    expired = 0
+
+    async with engine.connect() as conn:
+        # Session-level lock: held across the per-chunk commits on this connection
+        locked = (await conn.execute(select(func.pg_try_advisory_lock(EXPIRY_LOCK_KEY)))).scalar()
+        await conn.commit()
+        if not locked:
+            logger.info("Booking expiry skipped: another worker is sweeping")
+            return 0
+
+        try:
+            while True:
+                rows = (await conn.execute(_expire_chunk(now, deadline, batch_size))).all()
+                await conn.commit()
+                if not rows:
+                    break
+                expired += len(rows)
+                await touch_booking_lists(*{u for row in rows for u in (row.renter_id, row.owner_id)})
+                await invalidate_calendars(*{row.equipment_id for row in rows})
+                if len(rows) < batch_size:
+                    break
+        finally:
+            try:
+                # A failed chunk leaves the transaction aborted; the unlock would fail with it
+                await conn.rollback()
+                await conn.execute(select(func.pg_advisory_unlock(EXPIRY_LOCK_KEY)))
+                await conn.commit()
+            except BaseException:
+                # Never pool a connection that may still hold the lock: closing it releases it
+                await conn.invalidate()
+                raise
+
+    if expired:
+        logger.info(f"✅ Booking expiry: {expired} PENDING bookings expired")
+    return expired
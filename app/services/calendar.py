@@ -0,0 +1,182 @@
+# app/services/calendar.py
+"""
+Per-machine month calendar.
+
+Availability windows (concrete and recurring) and PENDING/ACCEPTED/COMPLETED bookings for one month
+are merged into contiguous occupancy runs covering the whole month:
+
+    closed  – no availability window
+    free    – inside a window, not booked
+    pending – held by a PENDING booking
+    booked  – ACCEPTED or COMPLETED booking
+
+plus per-day hour totals for drawing the month grid.
+
+⚠️ NOTE:
+- Months are UTC calendar months.
+- Responses are cached per (equipment, month) in a TwoTierCache group per
+  machine; any booking or availability change on the machine drops the
+  whole group. Call invalidate_calendars after commit, including after
+  deleting the machine (cache hits don't re-check that it exists).
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.db.models.availability import Availability
+from app.db.models.booking import Booking, BookingStatus
+from app.services.availability_rules import expand_rules, load_rules
+from app.utils.intervals import merge_intervals
+
+# Precedence: later states win where intervals overlap
+STATES = ("closed", "free", "pending", "booked")
+
+CALENDAR_BOOKING_STATES = {
+    BookingStatus.PENDING: "pending",
+    BookingStatus.ACCEPTED: "booked",
+    BookingStatus.COMPLETED: "booked",
+}
+
+calendar_cache = TwoTierCache(
+    "calendar",
+    local_ttl=settings.response_cache_local_ttl_seconds,
+    remote_ttl=settings.response_cache_ttl_seconds,
+    max_entries=settings.response_cache_max_entries,
+)
+
+
+# -----------------------------
+# Month helpers
+# -----------------------------
+def parse_month(month: str) -> tuple[datetime, datetime]:
+    """'YYYY-MM' -> [first instant, first instant of next month) in UTC."""
+    try:
+        year, mon = (int(part) for part in month.split("-"))
+        if not 1 <= year < 9999:  # the next month must still be a valid datetime
+            raise ValueError(year)
+        start = datetime(year, mon, 1, tzinfo=timezone.utc)
+        end = datetime(year + mon // 12, mon % 12 + 1, 1, tzinfo=timezone.utc)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+    return start, end
+
+
+def normalize_month(month: str) -> str:
+    """Canonical 'YYYY-MM' (so '2026-1' and '2026-01' share a cache entry)."""
+    return parse_month(month)[0].strftime("%Y-%m")
+
+
+# -----------------------------
+# Occupancy sweep
+# -----------------------------
+def occupancy_runs(layers: dict[str, list], lo: datetime, hi: datetime) -> list[dict]:
+    """
+    Sweep merged interval layers (state -> intervals) over [lo, hi) and emit
+    contiguous runs; where layers overlap the highest-precedence state wins.
+    """
+    merged = {state: merge_intervals(layers.get(state, ()), lo, hi) for state in STATES[1:]}
+    points = {lo, hi}
+    for intervals in merged.values():
+        for s, e in intervals:
+            points.update((s, e))
+    points = sorted(points)
+
+    cursors = {state: 0 for state in merged}
+    runs: list[dict] = []
+    for t0, t1 in zip(points, points[1:]):
+        state = STATES[0]
+        for name in STATES[1:]:
+            intervals = merged[name]
+            i = cursors[name]
+            while i < len(intervals) and intervals[i][1] <= t0:
+                i += 1
+            cursors[name] = i
+            if i < len(intervals) and intervals[i][0] <= t0:
+                state = name
+        if runs and runs[-1]["state"] == state:
+            runs[-1]["end"] = t1
+        else:
+            runs.append({"start": t0, "end": t1, "state": state})
+    return runs
+
+
+def day_totals(runs: list[dict], lo: datetime, hi: datetime) -> list[dict]:
+    """Hours per state for every day in [lo, hi)."""
+    days = []
+    i = 0
+    day = lo
+    while day < hi:
+        next_day = day + timedelta(days=1)
+        hours = {state: 0.0 for state in STATES}
+        while i < len(runs) and runs[i]["end"] <= day:
+            i += 1
+        j = i
+        while j < len(runs) and runs[j]["start"] < next_day:
+            run = runs[j]
+            overlap = min(run["end"], next_day) - max(run["start"], day)
+            hours[run["state"]] += overlap.total_seconds() / 3600
+            j += 1
+        days.append({"day": day.date(), **{f"{s}_hours": round(h, 2) for s, h in hours.items()}})
+        day = next_day
+    return days
+
+
+# -----------------------------
+# Query
+# -----------------------------
+async def build_month_calendar(session: AsyncSession, equipment_id: UUID, month: str) -> dict:
+    """Three indexed range queries (windows, rules, bookings) + an in-memory merge."""
+    lo, hi = parse_month(month)
+
+    res = await session.execute(
+        select(Availability.start_ts, Availability.end_ts).where(
+            Availability.equipment_id == equipment_id,
+            Availability.start_ts < hi,
+            Availability.end_ts > lo,
+        )
+    )
+    layers: dict[str, list] = {"free": [tuple(row) for row in res]}
+    rules = (await load_rules(session, [equipment_id], lo, hi))[equipment_id]
+    layers["free"].extend(expand_rules(rules, lo, hi))
+
+    res = await session.execute(
+        select(Booking.status, Booking.start_ts, Booking.end_ts).where(
+            Booking.equipment_id == equipment_id,
+            Booking.status.in_(tuple(CALENDAR_BOOKING_STATES)),
+            Booking.start_ts < hi,
+            Booking.end_ts > lo,
+        )
+    )
+    for status, start_ts, end_ts in res:
+        layers.setdefault(CALENDAR_BOOKING_STATES[status], []).append((start_ts, end_ts))
+
+    runs = occupancy_runs(layers, lo, hi)
+    return {
+        "equipment_id": equipment_id,
+        "month": lo.strftime("%Y-%m"),
+        "runs": runs,
+        "days": day_totals(runs, lo, hi),
+    }
+
+
+# -----------------------------
+# Cache keys / invalidation
+# -----------------------------
+def calendar_cache_key(equipment_id: UUID, month: str) -> str:
+    return f"{equipment_id}:{month}"
+
+
+def calendar_group(equipment_id: UUID) -> str:
+    return f"equipment:{equipment_id}"
+
+
+async def invalidate_calendars(*equipment_ids: UUID) -> None:
+    """Drop every cached month of the given machines. Call after commit."""
+    for equipment_id in {e for e in equipment_ids if e}:
+        await calendar_cache.delete_group(calendar_group(equipment_id))
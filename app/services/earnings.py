@@ -0,0 +1,151 @@
+# app/services/earnings.py
+"""
+Owner earnings summary.
+
+owner_monthly_earnings holds per (owner, month) totals of COMPLETED
+bookings, so the dashboard reads O(months) rows instead of aggregating
+bookings. Every path that completes a booking adds its amounts with an
+UPSERT inside the same transaction as the status change.
+
+reconcile_owner_earnings rebuilds the table (or one owner's rows) from raw
+bookings in streamed chunks; it doubles as the backfill:
+
+    python -m app.services.earnings [--owner <uuid>]
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import logger
+from app.db.session import AsyncSessionLocal
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.equipment import Equipment
+from app.db.models.owner_earnings import OwnerMonthlyEarnings
+
+RECONCILE_CHUNK_SIZE = 5000
+
+_TOTALS = ("completed_bookings", "gross", "commission", "earnings")
+
+
+def earnings_month(end_ts: datetime) -> date:
+    """Bookings count towards the (UTC) month they end in."""
+    end_ts = end_ts.astimezone(timezone.utc)
+    return date(end_ts.year, end_ts.month, 1)
+
+
+def _accumulate(totals: dict, owner_id: UUID, end_ts: datetime, price_total: int, commission_fee: int, owner_payout: int) -> None:
+    row = totals[(owner_id, earnings_month(end_ts))]
+    row["completed_bookings"] += 1
+    row["gross"] += price_total
+    row["commission"] += commission_fee
+    row["earnings"] += owner_payout
+
+
+def _new_totals() -> dict:
+    return defaultdict(lambda: dict.fromkeys(_TOTALS, 0))
+
+
+async def record_completed_bookings(session: AsyncSession, completed: Iterable[tuple[UUID, Booking]]) -> None:
+    """
+    Add (owner_id, booking) pairs that just became COMPLETED to the summary.
+    One multi-row UPSERT; does not commit – call inside the status-change
+    transaction so both land (or roll back) together.
+    """
+    totals = _new_totals()
+    for owner_id, b in completed:
+        _accumulate(totals, owner_id, b.end_ts, b.price_total, b.commission_fee, b.owner_payout)
+    if not totals:
+        return
+
+    stmt = insert(OwnerMonthlyEarnings).values([
+        {"owner_id": owner_id, "month": month, **values}
+        for (owner_id, month), values in totals.items()
+    ])
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[OwnerMonthlyEarnings.owner_id, OwnerMonthlyEarnings.month],
+            set_={
+                **{name: getattr(OwnerMonthlyEarnings, name) + getattr(stmt.excluded, name) for name in _TOTALS},
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def list_owner_earnings(
+    session: AsyncSession,
+    owner_id: UUID,
+    from_month: date | None = None,
+    to_month: date | None = None,
+) -> list[OwnerMonthlyEarnings]:
+    """Summary rows for one owner, oldest month first (primary-key range scan)."""
+    q = select(OwnerMonthlyEarnings).where(OwnerMonthlyEarnings.owner_id == owner_id)
+    if from_month:
+        q = q.where(OwnerMonthlyEarnings.month >= from_month)
+    if to_month:
+        q = q.where(OwnerMonthlyEarnings.month <= to_month)
+    res = await session.execute(q.order_by(OwnerMonthlyEarnings.month))
+    return list(res.scalars())
+
+
+async def reconcile_owner_earnings(owner_id: UUID | None = None, chunk_size: int = RECONCILE_CHUNK_SIZE) -> int:
+    """
+    Recompute the summary from COMPLETED bookings (all owners, or one) and
+    replace the stored rows. Returns the number of summary rows written.
+
+    The summary table is locked first (EXCLUSIVE: reads still work), so
+    completions racing with the rebuild wait and are applied on top of it
+    instead of being lost or double counted.
+    """
+    totals = _new_totals()
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("LOCK TABLE owner_monthly_earnings IN EXCLUSIVE MODE"))
+
+        q = (
+            select(
+                Equipment.owner_id,
+                Booking.end_ts,
+                Booking.price_total,
+                Booking.commission_fee,
+                Booking.owner_payout,
+            )
+            .join(Equipment, Equipment.id == Booking.equipment_id)
+            .where(Booking.status == BookingStatus.COMPLETED)
+            .execution_options(yield_per=chunk_size)
+        )
+        if owner_id:
+            q = q.where(Equipment.owner_id == owner_id)
+
+        res = await session.stream(q)
+        async for chunk in res.partitions():
+            for row in chunk:
+                _accumulate(totals, *row)
+
+        clear = delete(OwnerMonthlyEarnings)
+        if owner_id:
+            clear = clear.where(OwnerMonthlyEarnings.owner_id == owner_id)
+        await session.execute(clear)
+
+        rows = [{"owner_id": o, "month": m, **values} for (o, m), values in totals.items()]
+        for i in range(0, len(rows), chunk_size):
+            await session.execute(insert(OwnerMonthlyEarnings), rows[i:i + chunk_size])
+        await session.commit()
+
+    logger.info(f"✅ Owner earnings reconciled ({len(rows)} owner-months)")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from app.db import base  # noqa: F401 – register every model before mapping
+    parser = argparse.ArgumentParser(description="Backfill / reconcile owner_monthly_earnings from bookings")
+    parser.add_argument("--owner", type=UUID, default=None, help="Only this owner (default: everyone)")
+    args = parser.parse_args()
+    asyncio.run(reconcile_owner_earnings(args.owner))
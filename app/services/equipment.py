@@ -0,0 +1,297 @@
+# app/services/equipment.py
+"""
+Catalogue read queries.
+
+Listing endpoints select only the columns EquipmentOut needs and page with
+a keyset on the active sort key plus id, so response size and latency don't
+depend on how large the catalogue is or how deep the client has scrolled.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from urllib.parse import urlencode
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import JSON, select, func, tuple_, literal_column, false, or_, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.core.etag import bump_versions
+from app.db.models.equipment import Equipment, EquipmentPhoto, EquipmentStatus, EquipmentType
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# Columns needed by EquipmentOut – listings never load full ORM rows
+EQUIPMENT_OUT_COLUMNS = (
+    Equipment.id,
+    Equipment.type,
+    Equipment.brand,
+    Equipment.model,
+    Equipment.daily_rate,
+    Equipment.hourly_rate,
+    Equipment.operator_included,
+    Equipment.lat,
+    Equipment.lon,
+    Equipment.status,
+)
+
+MAX_PAGE_SIZE = 100
+
+# Must stay identical to the expression of ix_equipment_brand_model_trgm
+# (literals, not bind params, so the planner can match the GIN index)
+BRAND_MODEL_TEXT = (
+    func.coalesce(Equipment.brand, literal_column("''"))
+    .op("||")(literal_column("' '"))
+    .op("||")(func.coalesce(Equipment.model, literal_column("''")))
+)
+MAX_SEARCH_TERMS = 5
+
+# operator_included is nullable; NULL means "no operator" for filters and facets alike
+OPERATOR_INCLUDED = func.coalesce(Equipment.operator_included, false())
+
+
+def operator_included_is(value: bool):
+    """OPERATOR_INCLUDED == value, spelled so ix_equipment_operator_included can serve it."""
+    if value:
+        return Equipment.operator_included == true()
+    return or_(Equipment.operator_included == false(), Equipment.operator_included.is_(None))
+
+# Serialized catalogue responses (listing pages + detail bodies)
+equipment_cache = TwoTierCache(
+    "equipment",
+    local_ttl=settings.response_cache_local_ttl_seconds,
+    remote_ttl=settings.response_cache_ttl_seconds,
+    max_entries=settings.response_cache_max_entries,
+)
+LISTINGS_GROUP = "listings"
+
+# ETag version counters
+EQUIPMENT_LIST_COLLECTION = "equipment:list"
+
+
+class EquipmentSort(str, Enum):
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+
+
+# sort -> (key column, cursor value parser, descending?)
+_SORTS = {
+    EquipmentSort.NEWEST: (Equipment.created_at, datetime.fromisoformat, True),
+    EquipmentSort.PRICE_ASC: (Equipment.daily_rate, int, False),
+    EquipmentSort.PRICE_DESC: (Equipment.daily_rate, int, True),
+}
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_terms(q: str | None) -> list[str]:
+    """Split a free-text query ("mahindra 575") into ILIKE terms."""
+    return (q or "").split()[:MAX_SEARCH_TERMS]
+
+
+def catalogue_filters(
+    type_=None,
+    operator_included: bool | None = None,
+    min_rate: int | None = None,
+    max_rate: int | None = None,
+    q: str | None = None,
+) -> list:
+    """
+    WHERE clauses for catalogue reads. type + daily_rate range is served by
+    ix_equipment_type_daily_rate, the operator flag by
+    ix_equipment_operator_included and every search term by the trigram
+    index ix_equipment_brand_model_trgm (python -m app.explain_catalogue).
+    """
+    clauses = [Equipment.status == EquipmentStatus.APPROVED]
+    for term in search_terms(q):
+        clauses.append(BRAND_MODEL_TEXT.ilike(f"%{_like_escape(term)}%", escape="\\"))
+    if type_ is not None:
+        clauses.append(Equipment.type == type_)
+    if operator_included is not None:
+        clauses.append(operator_included_is(operator_included))
+    if min_rate is not None:
+        clauses.append(Equipment.daily_rate >= min_rate)
+    if max_rate is not None:
+        clauses.append(Equipment.daily_rate <= max_rate)
+    return clauses
+
+
+def facet_matrix(
+    min_rate: int | None = None,
+    max_rate: int | None = None,
+    q: str | None = None,
+):
+    """(type, operator_included, n) count matrix under the rate/search filters."""
+    return (
+        select(Equipment.type, OPERATOR_INCLUDED.label("operator_included"), func.count().label("n"))
+        .where(*catalogue_filters(min_rate=min_rate, max_rate=max_rate, q=q))
+        .group_by(Equipment.type, OPERATOR_INCLUDED)
+    )
+
+
+def summarize_facets(matrix, type_=None, operator_included: bool | None = None) -> dict:
+    """
+    Fold the tiny (type x operator_included) count matrix into facets; each
+    facet is summed with every *other* active filter applied, so selecting a
+    type still shows counts for the remaining types.
+    """
+    types: dict = defaultdict(int)
+    operator: dict = defaultdict(int)
+    total = 0
+    for eq_type, has_operator, count in matrix:
+        eq_type = EquipmentType(eq_type)
+        type_match = type_ is None or eq_type == type_
+        operator_match = operator_included is None or has_operator == operator_included
+        if operator_match:
+            types[eq_type] += count
+        if type_match:
+            operator[has_operator] += count
+        if type_match and operator_match:
+            total += count
+
+    return {"total": total, "types": dict(types), "operator_included": dict(operator)}
+
+
+async def attach_photos(session: AsyncSession, items: list[dict]) -> list[dict]:
+    """
+    Embed photos (ordered by position) into listing rows with ONE query for
+    the whole page, so the statement count doesn't grow with page size.
+    """
+    for item in items:
+        item["photos"] = []
+    if not items:
+        return items
+
+    by_id = {item["id"]: item for item in items}
+    q = (
+        select(EquipmentPhoto.equipment_id, EquipmentPhoto.id, EquipmentPhoto.url, EquipmentPhoto.position)
+        .where(EquipmentPhoto.equipment_id.in_(list(by_id)))
+        .order_by(
+            EquipmentPhoto.equipment_id,
+            EquipmentPhoto.position.asc().nulls_last(),
+            EquipmentPhoto.id,
+        )
+    )
+    res = await session.execute(q)
+    for row in res.mappings():
+        by_id[row["equipment_id"]]["photos"].append(
+            {"id": row["id"], "url": row["url"], "position": row["position"]}
+        )
+    return items
+
+
+async def list_approved_equipment_page(
+    session: AsyncSession,
+    limit: int = 20,
+    cursor: str | None = None,
+    sort: EquipmentSort = EquipmentSort.NEWEST,
+    type_=None,
+    operator_included: bool | None = None,
+    min_rate: int | None = None,
+    max_rate: int | None = None,
+    q: str | None = None,
+) -> dict:
+    """
+    One page of APPROVED equipment in the requested order.
+    Facet counts are only computed for the first page (no cursor), in the
+    same statement as the page: the page is LEFT JOINed onto a one-row JSON
+    aggregate of the facet matrix, so an empty page still carries facets.
+    Statement count is constant: page (+ facets) + photos.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    key_col, parse_key, descending = _SORTS[sort]
+
+    stmt = select(*EQUIPMENT_OUT_COLUMNS, key_col.label("sort_key")).where(
+        *catalogue_filters(type_, operator_included, min_rate, max_rate, q)
+    )
+    if descending:
+        stmt = stmt.order_by(key_col.desc(), Equipment.id.desc())
+    else:
+        stmt = stmt.order_by(key_col.asc(), Equipment.id.asc())
+
+    if cursor:
+        cursor_sort, last_key, last_id = decode_cursor(cursor, str, parse_key, UUID)
+        if cursor_sort != sort.value:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+        page_key = tuple_(key_col, Equipment.id)
+        after = tuple_(last_key, last_id)
+        stmt = stmt.where(page_key < after if descending else page_key > after)
+
+    facets = None
+    if cursor is None:
+        matrix = facet_matrix(min_rate, max_rate, q).subquery("facet_matrix")
+        facet_json = select(
+            func.coalesce(
+                func.json_agg(func.json_build_array(matrix.c.type, matrix.c.operator_included, matrix.c.n)),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            )
+        ).scalar_subquery()
+        facet_row = select(facet_json.label("facet_matrix")).subquery("facets")
+        page_rows = stmt.limit(limit + 1).subquery("page")
+        ordering = (page_rows.c.sort_key, page_rows.c.id)
+        stmt = (
+            select(page_rows, facet_row.c.facet_matrix)
+            .select_from(facet_row.outerjoin(page_rows, true()))
+            .order_by(*(c.desc() if descending else c.asc() for c in ordering))
+        )
+        rows = (await session.execute(stmt)).mappings().all()
+        facets = summarize_facets(rows[0]["facet_matrix"], type_, operator_included)
+        rows = [
+            {k: v for k, v in r.items() if k != "facet_matrix"}
+            for r in rows
+            if r["id"] is not None
+        ]
+    else:
+        rows = (await session.execute(stmt.limit(limit + 1))).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort.value, last["sort_key"], last["id"])
+
+    items = await attach_photos(session, [dict(r) for r in rows])
+    return {"items": items, "next_cursor": next_cursor, "facets": facets}
+
+
+# -----------------------------
+# Response cache keys / invalidation
+# -----------------------------
+def listing_cache_key(**params) -> str:
+    """Stable key for one listing page (None params are dropped)."""
+    items = sorted(
+        (k, v.value if isinstance(v, Enum) else v)
+        for k, v in params.items()
+        if v is not None
+    )
+    return "list:" + urlencode(items)
+
+
+def detail_cache_key(equipment_id: UUID) -> str:
+    return f"detail:{equipment_id}"
+
+
+def equipment_item_collection(equipment_id: UUID) -> str:
+    return f"equipment:item:{equipment_id}"
+
+
+async def invalidate_equipment(equipment_id: UUID, listings: bool = False) -> None:
+    """
+    Bump ETag versions and drop the cached detail body for one listing; do the
+    same for every listing page when the set of APPROVED equipment (or an
+    approved row) changed. Call after commit.
+    """
+    collections = [equipment_item_collection(equipment_id)]
+    if listings:
+        collections.append(EQUIPMENT_LIST_COLLECTION)
+    await bump_versions(*collections)
+
+    await equipment_cache.delete(detail_cache_key(equipment_id))
+    if listings:
+        await equipment_cache.delete_group(LISTINGS_GROUP)
@@ -0,0 +1,219 @@
+# app/services/fleet_import.py
+"""
+Bulk fleet import for owners / custom hiring centres.
+
+The request body (NDJSON or CSV) is read as a stream, each row is validated
+against EquipmentCreate, and valid rows are written with one multi-row
+INSERT + commit per batch – no per-row commit/refresh and no single giant
+transaction. Every input row gets an entry in the result report.
+
+⚠️ NOTE:
+- Bodies over MAX_BODY_BYTES (413) and lines / CSV records over
+  MAX_LINE_CHARS (400) abort the import; batches already committed stay.
+"""
+
+import codecs
+import csv
+import json
+import uuid
+from collections import deque
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import logger
+from app.db.models.equipment import Equipment, EquipmentStatus
+from app.schemas.equipment import EquipmentCreate
+
+BATCH_SIZE = 200
+MAX_ROWS = 5000
+MAX_BODY_BYTES = 10 * 1024 * 1024
+# One NDJSON line, or one CSV record including embedded newlines
+MAX_LINE_CHARS = 64 * 1024
+
+
+def _line_too_long() -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Line exceeds {MAX_LINE_CHARS} characters")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into text lines (UTF-8, BOM tolerant), enforcing the size limits."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail=f"Body exceeds {MAX_BODY_BYTES} bytes")
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if len(line) > MAX_LINE_CHARS:
+                raise _line_too_long()
+            yield line.rstrip("\r")
+        if len(buffer) > MAX_LINE_CHARS:
+            raise _line_too_long()
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Yield (row_no, record, parse_error) for NDJSON input; blank lines are skipped."""
+    row_no = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_no, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_no, None, "each line must be a JSON object"
+            continue
+        yield row_no, record, None
+
+
+def _still_quoted(line: str, quoted: bool) -> bool:
+    """
+    Whether a CSV record is inside a quoted field after this physical line
+    (default dialect: quotes open a field only at its start, "" escapes).
+    """
+    field_start = not quoted
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if quoted:
+            if ch == '"':
+                if i + 1 < len(line) and line[i + 1] == '"':
+                    i += 1
+                else:
+                    quoted = False
+        elif ch == ",":
+            field_start = True
+            i += 1
+            continue
+        elif ch == '"' and field_start:
+            quoted = True
+        field_start = False
+        i += 1
+    return quoted
+
+
+class _LineFeed:
+    """Iterator a csv.reader pulls physical lines from; filled one record at a time."""
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Yield (row_no, record, parse_error) for CSV input with a header line; empty cells are dropped.
+    Quoted fields may span lines: physical lines are buffered until the record
+    leaves its quoted field, then one csv.reader (kept for the whole body) parses it.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    row_no = 0
+    pending: list[str] = []
+    quoted = False
+    size = 0
+    async for line in lines:
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+        quoted = _still_quoted(line, quoted)
+        size += len(line) + 1
+        if size > MAX_LINE_CHARS:
+            raise _line_too_long()
+        if quoted:
+            continue  # the quoted field (and the record) continues on the next line
+
+        feed.lines.extend(f"{part}\n" for part in pending)
+        pending, size = [], 0
+        values = next(reader)
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row_no += 1
+        if len(values) != len(header):
+            yield row_no, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_no, {k: v.strip() for k, v in zip(header, values) if v.strip() != ""}, None
+
+    if pending:
+        yield row_no + 1, None, "unterminated quoted field"
+
+
+def _format_errors(e: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+async def _flush(session: AsyncSession, batch: list[tuple[int, dict]], results: list[dict]) -> None:
+    """Insert one batch with a single multi-row INSERT and commit it."""
+    if not batch:
+        return
+    try:
+        await session.execute(insert(Equipment), [values for _, values in batch])
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"❌ Fleet import batch failed: {e}")
+        results.extend({"row": n, "ok": False, "errors": ["database error"]} for n, _ in batch)
+        return
+    results.extend({"row": n, "ok": True, "id": values["id"]} for n, values in batch)
+
+
+async def import_fleet(
+    session: AsyncSession,
+    owner_id: uuid.UUID,
+    rows: AsyncIterator[tuple[int, dict | None, str | None]],
+) -> dict:
+    """Validate + insert streamed rows as DRAFT listings owned by owner_id."""
+    results: list[dict] = []
+    batch: list[tuple[int, dict]] = []
+
+    async for row_no, record, parse_error in rows:
+        if row_no > MAX_ROWS:
+            results.append({"row": row_no, "ok": False, "errors": [f"import limited to {MAX_ROWS} rows"]})
+            break
+        if parse_error:
+            results.append({"row": row_no, "ok": False, "errors": [parse_error]})
+            continue
+        try:
+            payload = EquipmentCreate(**record)
+        except ValidationError as e:
+            results.append({"row": row_no, "ok": False, "errors": _format_errors(e)})
+            continue
+
+        batch.append((row_no, {
+            "id": uuid.uuid4(),
+            "owner_id": owner_id,
+            **payload.model_dump(),
+            "status": EquipmentStatus.DRAFT,
+        }))
+        if len(batch) >= BATCH_SIZE:
+            await _flush(session, batch, results)
+            batch = []
+
+    await _flush(session, batch, results)
+
+    results.sort(key=lambda r: r["row"])
+    created = sum(1 for r in results if r["ok"])
+    return {"created": created, "failed": len(results) - created, "results": results}
@@ -1,14 +1,124 @@
 # app/services/geo.py
 
 """
-Geo service placeholder.
+Geo service.
 
-Later we’ll add:
-- Haversine distance calculation
-- PostGIS / geospatial queries
-- Filtering equipment by radius
+- Haversine distance calculation (pure Python + SQL expression)
+- Bounding-box prefilter so radius queries can use ix_equipment_lat_lon
+- Filtering approved equipment by radius, nearest first
 """
 
-def dummy_location_service():
-    return {"lat": 0.0, "lon": 0.0}
- 
+import math
+
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.equipment import Equipment, EquipmentStatus
+from app.services.equipment import EQUIPMENT_OUT_COLUMNS, attach_photos
+
+# Mean earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing the radius circle.
+    Near the poles / antimeridian the longitude range widens to the full globe
+    instead of wrapping, which keeps the SQL filter a simple BETWEEN.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def haversine_sql(lat: float, lon: float, lat_col=Equipment.lat, lon_col=Equipment.lon):
+    """SQL expression computing haversine distance (km) from (lat, lon) to the given columns."""
+    phi1 = math.radians(lat)
+    phi2 = func.radians(lat_col)
+    dphi = func.radians(lat_col - lat)
+    dlmb = func.radians(lon_col - lon)
+    a = func.power(func.sin(dphi / 2), 2) + math.cos(phi1) * func.cos(phi2) * func.power(func.sin(dlmb / 2), 2)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+async def find_nearby_equipment(
+    session: AsyncSession,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    limit: int = 50,
+) -> list[dict]:
+    """
+    Approved equipment within radius_km of (lat, lon), nearest first.
+
+    The bounding box is an index-friendly prefilter (ix_equipment_lat_lon);
+    exact distances are computed by Postgres for the surviving candidates only,
+    then sorted and cut to `limit`, so the payload never grows with the catalogue.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    distance = haversine_sql(lat, lon)
+
+    q = (
+        select(*EQUIPMENT_OUT_COLUMNS, distance.label("distance_km"))
+        .where(
+            and_(
+                Equipment.status == EquipmentStatus.APPROVED,
+                Equipment.lat.between(min_lat, max_lat),
+                Equipment.lon.between(min_lon, max_lon),
+                distance <= radius_km,
+            )
+        )
+        .order_by(distance)
+        .limit(limit)
+    )
+    res = await session.execute(q)
+    return await attach_photos(session, [dict(row) for row in res.mappings()])
+
+
+async def find_equipment_pins_in_bbox(
+    session: AsyncSession,
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    limit: int = 500,
+) -> list[dict]:
+    """
+    Approved equipment pins inside a viewport (Postgres fallback for the geo index).
+    min_lon > max_lon means the box crosses the antimeridian.
+    """
+    if min_lon > max_lon:
+        lon_filter = or_(Equipment.lon >= min_lon, Equipment.lon <= max_lon)
+    else:
+        lon_filter = Equipment.lon.between(min_lon, max_lon)
+
+    q = (
+        select(Equipment.id, Equipment.lat, Equipment.lon, Equipment.daily_rate, Equipment.hourly_rate)
+        .where(
+            and_(
+                Equipment.status == EquipmentStatus.APPROVED,
+                Equipment.lat.between(min_lat, max_lat),
+                lon_filter,
+            )
+        )
+        .limit(limit)
+    )
+    res = await session.execute(q)
+    return [dict(row) for row in res.mappings()]
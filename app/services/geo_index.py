@@ -0,0 +1,312 @@
+# app/services/geo_index.py
+
+"""
+In-process spatial index of APPROVED equipment.
+
+Equipment is bucketed by geohash cell. Each cell keeps its points in
+compact arrays (lat/lon/rates) so viewport and radius queries for the map
+screen are answered from memory without touching Postgres.
+
+⚠️ NOTE:
+- Every worker holds its own copy. Writes on one worker update only that
+  worker's index; the periodic rebuild (and the admin rebuild endpoint)
+  brings every worker back in line with the database.
+- All mutations are synchronous (no awaits), so they are atomic with
+  respect to the event loop.
+- While a rebuild is reading the database, mutations on the live index are
+  journaled and replayed onto the fresh snapshot before it is swapped in,
+  so writes made during the rebuild are not lost.
+"""
+
+import math
+from array import array
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.logging import logger
+from app.db.session import AsyncSessionLocal
+from app.db.models.equipment import Equipment, EquipmentStatus
+from app.services.geo import bounding_box, haversine_km
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# ~4.9 km x 4.9 km cells
+DEFAULT_PRECISION = 5
+
+# hourly_rate is nullable; arrays can't hold None
+_NO_RATE = -1
+
+
+# -----------------------------
+# Geohash helpers
+# -----------------------------
+def geohash_encode(lat: float, lon: float, precision: int = DEFAULT_PRECISION) -> str:
+    """Encode a coordinate as a geohash string."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bit, ch, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch = (ch << 1) | 1
+                lon_lo = mid
+            else:
+                ch <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int = DEFAULT_PRECISION) -> tuple[float, float]:
+    """Return (cell_height_deg, cell_width_deg) for the given precision."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class _Cell:
+    __slots__ = ("ids", "lats", "lons", "daily_rates", "hourly_rates")
+
+    def __init__(self):
+        self.ids: list[UUID] = []
+        self.lats = array("d")
+        self.lons = array("d")
+        self.daily_rates = array("l")
+        self.hourly_rates = array("l")
+
+    def append(self, eq_id: UUID, lat: float, lon: float, daily_rate: int, hourly_rate: int | None) -> int:
+        self.ids.append(eq_id)
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.daily_rates.append(daily_rate)
+        self.hourly_rates.append(_NO_RATE if hourly_rate is None else hourly_rate)
+        return len(self.ids) - 1
+
+    def swap_remove(self, idx: int) -> UUID | None:
+        """Remove slot idx by moving the last slot into it. Returns the moved id (if any)."""
+        last = len(self.ids) - 1
+        moved = None
+        if idx != last:
+            moved = self.ids[last]
+            self.ids[idx] = moved
+            self.lats[idx] = self.lats[last]
+            self.lons[idx] = self.lons[last]
+            self.daily_rates[idx] = self.daily_rates[last]
+            self.hourly_rates[idx] = self.hourly_rates[last]
+        self.ids.pop()
+        self.lats.pop()
+        self.lons.pop()
+        self.daily_rates.pop()
+        self.hourly_rates.pop()
+        return moved
+
+    def pin(self, idx: int) -> dict:
+        hourly = self.hourly_rates[idx]
+        return {
+            "id": self.ids[idx],
+            "lat": self.lats[idx],
+            "lon": self.lons[idx],
+            "daily_rate": self.daily_rates[idx],
+            "hourly_rate": None if hourly == _NO_RATE else hourly,
+        }
+
+
+class GeoGridIndex:
+    """Geohash-bucketed point index with incremental upsert/remove."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        self.precision = precision
+        self.cell_h, self.cell_w = geohash_cell_size(precision)
+        self._cells: dict[str, _Cell] = {}
+        self._where: dict[UUID, tuple[str, int]] = {}
+        self.loaded = False
+        # Mutations made while rebuilds are in flight (None = not journaling)
+        self._journal: list[tuple[str, tuple]] | None = None
+        self._rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    # ---------- maintenance ----------
+    def upsert(self, eq_id: UUID, lat: float, lon: float, daily_rate: int, hourly_rate: int | None = None) -> None:
+        if self._journal is not None:
+            self._journal.append(("upsert", (eq_id, lat, lon, daily_rate, hourly_rate)))
+        self._drop(eq_id)
+        key = geohash_encode(lat, lon, self.precision)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = _Cell()
+        self._where[eq_id] = (key, cell.append(eq_id, lat, lon, daily_rate, hourly_rate))
+
+    def remove(self, eq_id: UUID) -> None:
+        if self._journal is not None:
+            self._journal.append(("remove", (eq_id,)))
+        self._drop(eq_id)
+
+    def _drop(self, eq_id: UUID) -> None:
+        loc = self._where.pop(eq_id, None)
+        if loc is None:
+            return
+        key, idx = loc
+        cell = self._cells[key]
+        moved = cell.swap_remove(idx)
+        if moved is not None:
+            self._where[moved] = (key, idx)
+        if not cell.ids:
+            del self._cells[key]
+
+    def sync(self, eq: Equipment) -> None:
+        """Reflect the current state of an Equipment row in the index."""
+        if eq.status == EquipmentStatus.APPROVED and eq.lat is not None and eq.lon is not None:
+            self.upsert(eq.id, eq.lat, eq.lon, eq.daily_rate, eq.hourly_rate)
+        else:
+            self.remove(eq.id)
+
+    def begin_rebuild(self) -> None:
+        """Start journaling mutations for a snapshot that is about to be loaded."""
+        self._rebuilds += 1
+        if self._journal is None:
+            self._journal = []
+
+    def abort_rebuild(self) -> None:
+        """A rebuild failed before replace_with; stop journaling if it was the last one."""
+        self._rebuilds = max(0, self._rebuilds - 1)
+        if not self._rebuilds:
+            self._journal = None
+
+    def replace_with(self, other: "GeoGridIndex") -> None:
+        """
+        Atomically swap in the contents of a freshly built index, after
+        replaying mutations journaled since begin_rebuild onto it.
+        """
+        for op, args in self._journal or ():
+            getattr(other, op)(*args)
+        self._cells = other._cells
+        self._where = other._where
+        self.loaded = True
+        self.abort_rebuild()
+
+    # ---------- queries ----------
+    def _cell_keys(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+        """Populated cell keys that may contain points inside the box."""
+        i0 = math.floor((min_lat + 90.0) / self.cell_h)
+        i1 = math.floor((max_lat + 90.0) / self.cell_h)
+        j0 = math.floor((min_lon + 180.0) / self.cell_w)
+        j1 = math.floor((max_lon + 180.0) / self.cell_w)
+
+        # Large viewports: walking populated cells is cheaper than enumerating the grid
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._cells):
+            return list(self._cells)
+
+        keys = []
+        for i in range(i0, i1 + 1):
+            lat = min(-90.0 + (i + 0.5) * self.cell_h, 90.0)
+            for j in range(j0, j1 + 1):
+                lon = min(-180.0 + (j + 0.5) * self.cell_w, 180.0)
+                key = geohash_encode(lat, lon, self.precision)
+                if key in self._cells:
+                    keys.append(key)
+        return keys
+
+    def query_bbox(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Pins inside the viewport. min_lon > max_lon means the box crosses the antimeridian."""
+        if min_lon > max_lon:
+            ranges = [(min_lon, 180.0), (-180.0, max_lon)]
+        else:
+            ranges = [(min_lon, max_lon)]
+
+        pins = []
+        for lo, hi in ranges:
+            for key in self._cell_keys(min_lat, max_lat, lo, hi):
+                cell = self._cells[key]
+                lats, lons = cell.lats, cell.lons
+                for idx in range(len(cell.ids)):
+                    if min_lat <= lats[idx] <= max_lat and lo <= lons[idx] <= hi:
+                        pins.append(cell.pin(idx))
+                        if limit is not None and len(pins) >= limit:
+                            return pins
+        return pins
+
+    def query_radius(self, lat: float, lon: float, radius_km: float, limit: int = 50) -> list[dict]:
+        """Pins within radius_km of (lat, lon), nearest first."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        hits = []
+        for key in self._cell_keys(min_lat, max_lat, min_lon, max_lon):
+            cell = self._cells[key]
+            lats, lons = cell.lats, cell.lons
+            for idx in range(len(cell.ids)):
+                d = haversine_km(lat, lon, lats[idx], lons[idx])
+                if d <= radius_km:
+                    hits.append((d, key, idx))
+
+        hits.sort(key=lambda h: h[0])
+        pins = []
+        for d, key, idx in hits[:limit]:
+            pin = self._cells[key].pin(idx)
+            pin["distance_km"] = d
+            pins.append(pin)
+        return pins
+
+
+# Process-wide index
+equipment_index = GeoGridIndex()
+
+
+# -----------------------------
+# DB loading
+# -----------------------------
+async def rebuild_equipment_index() -> int:
+    """Rebuild the index from Postgres (fixes any drift). Returns number of pins."""
+    fresh = GeoGridIndex(equipment_index.precision)
+    equipment_index.begin_rebuild()
+    try:
+        async with AsyncSessionLocal() as session:
+            res = await session.stream(
+                select(
+                    Equipment.id,
+                    Equipment.lat,
+                    Equipment.lon,
+                    Equipment.daily_rate,
+                    Equipment.hourly_rate,
+                ).where(
+                    Equipment.status == EquipmentStatus.APPROVED,
+                    Equipment.lat.is_not(None),
+                    Equipment.lon.is_not(None),
+                )
+            )
+            async for row in res:
+                fresh.upsert(row.id, row.lat, row.lon, row.daily_rate, row.hourly_rate)
+    except BaseException:
+        equipment_index.abort_rebuild()
+        raise
+
+    equipment_index.replace_with(fresh)
+    logger.info(f"✅ Equipment geo index rebuilt ({len(fresh)} pins)")
+    return len(fresh)
+
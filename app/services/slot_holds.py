@@ -0,0 +1,231 @@
+# app/services/slot_holds.py
+"""
+Short-lived slot holds during checkout.
+
+A hold claims every UTC day touched by [start, end) on one machine for
+SLOT_HOLD_TTL_SECONDS. Holds are plain Redis keys written by a Lua script,
+so competing checkouts are decided in Redis – first one in wins, the rest
+fail immediately – without DB transactions or row locks.
+
+    hold:{<equipment_id>}:<YYYY-MM-DD>     -> <user_id>:<token>  (one key per day)
+    hold:{<equipment_id>}:token:<token>    -> JSON {user_id, start_ts, end_ts}
+    hold:{<equipment_id>}:user:<user_id>   -> token  (the user's current hold)
+
+The {equipment_id} hash tag keeps one machine's keys in one cluster slot.
+
+⚠️ NOTE:
+- Holds only arbitrate checkout; the bookings exclusion constraint is
+  still the source of truth. If Redis is unavailable holds are skipped
+  (fail-open) and creation falls back to the constraint.
+- Days are held per user: a user re-holding (e.g. after changing dates)
+  replaces their previous hold on the machine instead of colliding with it.
+"""
+
+import json
+import secrets
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.redis import redis_client
+
+MAX_HOLD_DAYS = 31
+
+# KEYS: new day keys (ARGV[4] of them), token key, user key, then the user's
+# previous hold if any: its day keys..., its token key (last).
+# ARGV: day value, ttl_ms, token payload, day count, "<user_id>:", token,
+# previous day value ('' for none).
+# Returns 0 on success, else the 1-based index of the first day held by another user.
+_ACQUIRE = """
+local days = tonumber(ARGV[4])
+local mine = ARGV[5]
+for i = 1, days do
+    local owner = redis.call('get', KEYS[i])
+    if owner and string.sub(owner, 1, #mine) ~= mine then
+        return i
+    end
+end
+if ARGV[7] ~= '' then
+    for i = days + 3, #KEYS - 1 do
+        if redis.call('get', KEYS[i]) == ARGV[7] then
+            redis.call('del', KEYS[i])
+        end
+    end
+    redis.call('del', KEYS[#KEYS])
+end
+for i = 1, days do
+    redis.call('set', KEYS[i], ARGV[1], 'PX', ARGV[2])
+end
+redis.call('set', KEYS[days + 1], ARGV[3], 'PX', ARGV[2])
+redis.call('set', KEYS[days + 2], ARGV[6], 'PX', ARGV[2])
+return 0
+"""
+
+# KEYS: day keys. ARGV: "<user_id>:". Same return convention as _ACQUIRE.
+_CHECK = """
+for i = 1, #KEYS do
+    local owner = redis.call('get', KEYS[i])
+    if owner and string.sub(owner, 1, #ARGV[1]) ~= ARGV[1] then
+        return i
+    end
+end
+return 0
+"""
+
+# KEYS: day keys..., token key, user key (last). ARGV: day value, token.
+# Deletes only keys this token owns.
+_RELEASE = """
+local released = 0
+for i = 1, #KEYS - 2 do
+    if redis.call('get', KEYS[i]) == ARGV[1] then
+        released = released + redis.call('del', KEYS[i])
+    end
+end
+redis.call('del', KEYS[#KEYS - 1])
+if redis.call('get', KEYS[#KEYS]) == ARGV[2] then
+    redis.call('del', KEYS[#KEYS])
+end
+return released
+"""
+
+
+# -----------------------------
+# Key helpers
+# -----------------------------
+def hold_days(start: datetime, end: datetime) -> list[date]:
+    """UTC days touched by [start, end)."""
+    first = start.astimezone(timezone.utc).date()
+    last = (end.astimezone(timezone.utc) - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _day_key(equipment_id: UUID, day: date) -> str:
+    return f"hold:{{{equipment_id}}}:{day.isoformat()}"
+
+
+def _token_key(equipment_id: UUID, token: str) -> str:
+    return f"hold:{{{equipment_id}}}:token:{token}"
+
+
+def _user_key(equipment_id: UUID, user_id: UUID | str) -> str:
+    return f"hold:{{{equipment_id}}}:user:{user_id}"
+
+
+def _day_value(user_id: UUID | str, token: str) -> str:
+    return f"{user_id}:{token}"
+
+
+def _held_day_keys(equipment_id: UUID, raw: str) -> list[str]:
+    """Day keys of a hold, from its token payload."""
+    held = json.loads(raw)
+    days = hold_days(datetime.fromisoformat(held["start_ts"]), datetime.fromisoformat(held["end_ts"]))
+    return [_day_key(equipment_id, d) for d in days]
+
+
+def _token_equipment(token: str) -> UUID | None:
+    try:
+        return UUID(token.split(".", 1)[0])
+    except ValueError:
+        return None
+
+
+# -----------------------------
+# API
+# -----------------------------
+async def acquire_hold(user_id: UUID, equipment_id: UUID, start: datetime, end: datetime) -> dict | None:
+    """
+    Hold the days of [start, end) for this user, replacing the user's
+    previous hold on this machine. Raises 409 if any day is held by another
+    user's checkout. Returns None when Redis is unavailable.
+    """
+    days = hold_days(start, end)
+    if len(days) > MAX_HOLD_DAYS:
+        raise HTTPException(status_code=400, detail=f"Holds are limited to {MAX_HOLD_DAYS} days")
+    if not redis_client:
+        return None
+
+    ttl = settings.slot_hold_ttl_seconds
+    token = f"{equipment_id}.{secrets.token_urlsafe(16)}"
+    payload = json.dumps({"user_id": str(user_id), "start_ts": start.isoformat(), "end_ts": end.isoformat()})
+    keys = [_day_key(equipment_id, d) for d in days]
+    keys += [_token_key(equipment_id, token), _user_key(equipment_id, user_id)]
+    try:
+        previous, previous_value = await redis_client.get(_user_key(equipment_id, user_id)), ""
+        raw = await redis_client.get(_token_key(equipment_id, previous)) if previous else None
+        if raw:
+            # Stale by the time the script runs? Its owned-value check then deletes nothing.
+            keys += _held_day_keys(equipment_id, raw) + [_token_key(equipment_id, previous)]
+            previous_value = _day_value(user_id, previous)
+        conflict = await redis_client.eval(
+            _ACQUIRE, len(keys), *keys,
+            _day_value(user_id, token), ttl * 1000, payload, len(days), f"{user_id}:", token, previous_value,
+        )
+    except RedisError as e:
+        logger.error(f"Redis error acquiring slot hold: {e}")
+        return None
+    if conflict:
+        raise HTTPException(status_code=409, detail=f"{days[conflict - 1].isoformat()} is held by another checkout")
+
+    return {
+        "token": token,
+        "equipment_id": equipment_id,
+        "start_ts": start,
+        "end_ts": end,
+        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+    }
+
+
+async def ensure_not_held(user_id: UUID, equipment_id: UUID, start: datetime, end: datetime, token: str | None) -> None:
+    """
+    Booking-time check: 409 unless every day of [start, end) is free or held
+    by this user, and 403 if `token` (still live) belongs to another user.
+    """
+    if not redis_client:
+        return
+    try:
+        if token and _token_equipment(token) == equipment_id:
+            raw = await redis_client.get(_token_key(equipment_id, token))
+            if raw is not None and json.loads(raw)["user_id"] != str(user_id):
+                raise HTTPException(status_code=403, detail="Slot hold belongs to another user")
+        keys = [_day_key(equipment_id, d) for d in hold_days(start, end)]
+        conflict = await redis_client.eval(_CHECK, len(keys), *keys, f"{user_id}:")
+    except RedisError as e:
+        logger.error(f"Redis error checking slot holds: {e}")
+        return
+    if conflict:
+        raise HTTPException(status_code=409, detail="This slot is held by another checkout; try again shortly")
+
+
+async def release_hold(token: str) -> int:
+    """Drop a hold early (after booking, or on checkout cancel). Returns days released."""
+    equipment_id = _token_equipment(token)
+    if not redis_client or equipment_id is None:
+        return 0
+    try:
+        raw = await redis_client.get(_token_key(equipment_id, token))
+        if raw is None:
+            return 0
+        user_id = json.loads(raw)["user_id"]
+        keys = _held_day_keys(equipment_id, raw)
+        keys += [_token_key(equipment_id, token), _user_key(equipment_id, user_id)]
+        return await redis_client.eval(_RELEASE, len(keys), *keys, _day_value(user_id, token), token)
+    except RedisError as e:
+        logger.error(f"Redis error releasing slot hold: {e}")
+        return 0
+
+
+async def hold_owner(token: str) -> str | None:
+    """user_id that created the hold, or None if it expired / never existed."""
+    equipment_id = _token_equipment(token)
+    if not redis_client or equipment_id is None:
+        return None
+    try:
+        raw = await redis_client.get(_token_key(equipment_id, token))
+    except RedisError as e:
+        logger.error(f"Redis error reading slot hold: {e}")
+        return None
+    return json.loads(raw)["user_id"] if raw else None
@@ -0,0 +1,142 @@
+# app/services/slots.py
+"""
+Bookable free slots ("next free 2-day slot") for a batch of machines.
+
+Windows (concrete rows + expanded rules) and active bookings for the whole
+batch are loaded up front, three queries regardless of batch size; then
+each machine's bookings are swept off its windows in memory
+(utils.intervals.subtract_intervals) and the first N gaps of the requested
+length are kept.
+
+Micro-benchmark on synthetic intervals (no DB needed):
+
+    python -m app.services.slots [--machines 1000] [--days 92] [--rounds 5]
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.booking import Booking
+from app.services.availability import ACTIVE_BOOKING_PREDICATE, overlaps
+from app.services.availability_rules import load_windows
+from app.utils.intervals import free_slots, merge_intervals
+
+# Machines per slot search, and slots returned per machine
+MAX_SLOT_EQUIPMENT = 1000
+MAX_SLOTS_PER_EQUIPMENT = 10
+
+
+async def load_busy(
+    session: AsyncSession,
+    equipment_ids: Iterable[UUID],
+    lo: datetime,
+    hi: datetime,
+) -> dict[UUID, list[tuple[datetime, datetime]]]:
+    """Merged PENDING/ACCEPTED booking intervals within [lo, hi), per equipment – one query."""
+    ids = list(set(equipment_ids))
+    busy: dict[UUID, list] = defaultdict(list)
+    if not ids:
+        return busy
+    res = await session.execute(
+        select(Booking.equipment_id, Booking.start_ts, Booking.end_ts).where(
+            Booking.equipment_id.in_(ids),
+            ACTIVE_BOOKING_PREDICATE,
+            overlaps(lo, hi),
+        )
+    )
+    for equipment_id, start_ts, end_ts in res:
+        busy[equipment_id].append((start_ts, end_ts))
+    return {equipment_id: merge_intervals(found, lo, hi) for equipment_id, found in busy.items()}
+
+
+def compute_free_slots(
+    windows: dict[UUID, list],
+    busy: dict[UUID, list],
+    min_duration: timedelta,
+    count: int,
+) -> dict[UUID, list[tuple[datetime, datetime]]]:
+    """Pure part of find_free_slots: sweep every machine's bookings off its windows."""
+    return {
+        equipment_id: free_slots(found, busy.get(equipment_id, ()), min_duration, count)
+        for equipment_id, found in windows.items()
+    }
+
+
+async def find_free_slots(
+    session: AsyncSession,
+    equipment_ids: Iterable[UUID],
+    lo: datetime,
+    hi: datetime,
+    min_duration: timedelta,
+    count: int = 1,
+) -> dict[UUID, list[tuple[datetime, datetime]]]:
+    """
+    First `count` free gaps of at least min_duration within [lo, hi) for
+    every machine (empty list if none). Gaps are returned whole; any
+    sub-range of min_duration inside one is bookable.
+    """
+    ids = list(set(equipment_ids))
+    windows = await load_windows(session, ids, lo, hi)
+    busy = await load_busy(session, ids, lo, hi)
+    return compute_free_slots(windows, busy, min_duration, count)
+
+
+# -----------------------------
+# Micro-benchmark
+# -----------------------------
+def _synthetic(machines: int, days: int, seed: int = 7) -> tuple[dict, dict, datetime, datetime]:
+    """Daily 06–18 windows per machine and 0–2 random multi-day bookings per week."""
+    rnd = random.Random(seed)
+    lo = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    hi = lo + timedelta(days=days)
+    windows, busy = {}, {}
+    for i in range(machines):
+        key = UUID(int=i)
+        windows[key] = [
+            (lo + timedelta(days=d, hours=6), lo + timedelta(days=d, hours=18)) for d in range(days)
+        ]
+        bookings = []
+        for week in range(0, days, 7):
+            for _ in range(rnd.randint(0, 2)):
+                start = lo + timedelta(days=week + rnd.randint(0, 6), hours=rnd.choice((6, 12)))
+                bookings.append((start, start + timedelta(hours=rnd.choice((6, 24, 48)))))
+        busy[key] = merge_intervals(bookings, lo, hi)
+    return windows, busy, lo, hi
+
+
+def _benchmark(machines: int, days: int, rounds: int) -> None:
+    windows, busy, lo, hi = _synthetic(machines, days)
+    # Daily windows never span 2 days; 10 h exercises the "skip short gaps" path
+    for label, min_duration, count in (
+        ("first 10h slot", timedelta(hours=10), 1),
+        ("first 5 x 10h slots", timedelta(hours=10), 5),
+        ("no slot (scan all)", timedelta(hours=13), 1),
+    ):
+        timings = []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            compute_free_slots(windows, busy, min_duration, count)
+            timings.append(time.perf_counter() - t0)
+        print(f"{label:<22} {machines} machines x {days} days: best {min(timings) * 1000:.1f} ms")
+
+    t0 = time.perf_counter()
+    for key, found in busy.items():
+        merge_intervals(found, lo, hi)
+    print(f"{'merge bookings':<22} {machines} machines: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Free-slot sweep micro-benchmark on synthetic intervals")
+    parser.add_argument("--machines", type=int, default=MAX_SLOT_EQUIPMENT)
+    parser.add_argument("--days", type=int, default=92)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    _benchmark(args.machines, args.days, args.rounds)
@@ -0,0 +1,219 @@
+# app/services/suggest.py
+
+"""
+In-process brand/model autocomplete for APPROVED equipment.
+
+Every listing contributes its brand and its "brand model" phrase. Each
+phrase is indexed under every word suffix ("mahindra 575 di", "575 di",
+"di") in a sorted array, so a prefix lookup is a bisect plus a short scan
+and never touches Postgres.
+
+⚠️ NOTE:
+- Per-worker, like the geo index: maintained incrementally by the write
+  handlers and rebuilt from the DB periodically to fix drift.
+- Search keys are kept sorted on every write (insort / bisect delete), so
+  lookups never sort. A fresh index built by the rebuild defers its keys
+  and sorts them once in replace_with, off the request path.
+- Writes made while a rebuild is reading the DB are journaled and replayed
+  onto the fresh index before it is swapped in (same as the geo index).
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.logging import logger
+from app.db.session import AsyncSessionLocal
+from app.db.models.equipment import Equipment, EquipmentStatus
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str | None) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def listing_phrases(brand: str | None, model: str | None) -> list[str]:
+    """Display phrases a listing contributes: brand alone and brand + model."""
+    brand = (brand or "").strip()
+    model = (model or "").strip()
+    phrases = []
+    if brand:
+        phrases.append(brand)
+    if model:
+        phrases.append(f"{brand} {model}".strip())
+    return phrases
+
+
+def _suffix_entries(norm: str) -> list[tuple[str, str, int]]:
+    """(search key, normalized phrase, word position) for every word suffix."""
+    words = norm.split(" ")
+    return [(" ".join(words[pos:]), norm, pos) for pos in range(len(words))]
+
+
+class SuggestIndex:
+    def __init__(self, defer_keys: bool = False):
+        self._listing_phrases: dict[UUID, list[str]] = {}
+        # normalized phrase -> [display text, number of listings]
+        self._phrases: dict[str, list] = {}
+        # sorted (search key, normalized phrase, word position)
+        self._entries: list[tuple[str, str, int]] = []
+        # Bulk loads skip per-phrase key maintenance; replace_with sorts once
+        self._defer_keys = defer_keys
+        # Mutations made while rebuilds are in flight (None = not journaling)
+        self._journal: list[tuple[str, tuple]] | None = None
+        self._rebuilds = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    # ---------- maintenance ----------
+    def _add_phrase(self, display: str) -> None:
+        norm = normalize(display)
+        if not norm:
+            return
+        entry = self._phrases.get(norm)
+        if entry is None:
+            self._phrases[norm] = [display, 1]
+            if not self._defer_keys:
+                for key in _suffix_entries(norm):
+                    insort(self._entries, key)
+        else:
+            entry[1] += 1
+
+    def _drop_phrase(self, display: str) -> None:
+        norm = normalize(display)
+        entry = self._phrases.get(norm)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._phrases[norm]
+            if not self._defer_keys:
+                for key in _suffix_entries(norm):
+                    i = bisect_left(self._entries, key)
+                    if i < len(self._entries) and self._entries[i] == key:
+                        del self._entries[i]
+
+    def upsert(self, eq_id: UUID, brand: str | None, model: str | None) -> None:
+        if self._journal is not None:
+            self._journal.append(("upsert", (eq_id, brand, model)))
+        self._drop_listing(eq_id)
+        phrases = listing_phrases(brand, model)
+        if not phrases:
+            return
+        self._listing_phrases[eq_id] = phrases
+        for display in phrases:
+            self._add_phrase(display)
+
+    def remove(self, eq_id: UUID) -> None:
+        if self._journal is not None:
+            self._journal.append(("remove", (eq_id,)))
+        self._drop_listing(eq_id)
+
+    def _drop_listing(self, eq_id: UUID) -> None:
+        for display in self._listing_phrases.pop(eq_id, ()):
+            self._drop_phrase(display)
+
+    def sync(self, eq: Equipment) -> None:
+        """Reflect the current state of an Equipment row in the index."""
+        if eq.status == EquipmentStatus.APPROVED:
+            self.upsert(eq.id, eq.brand, eq.model)
+        else:
+            self.remove(eq.id)
+
+    def begin_rebuild(self) -> None:
+        """Start journaling mutations for a fresh index that is about to be loaded."""
+        self._rebuilds += 1
+        if self._journal is None:
+            self._journal = []
+
+    def abort_rebuild(self) -> None:
+        """A rebuild failed before replace_with; stop journaling if it was the last one."""
+        self._rebuilds = max(0, self._rebuilds - 1)
+        if not self._rebuilds:
+            self._journal = None
+
+    def replace_with(self, other: "SuggestIndex") -> None:
+        """
+        Sort the fresh index's keys, replay mutations journaled since
+        begin_rebuild onto it, then swap it in.
+        """
+        if other._defer_keys:
+            other._entries = sorted(e for norm in other._phrases for e in _suffix_entries(norm))
+            other._defer_keys = False
+        for op, args in self._journal or ():
+            getattr(other, op)(*args)
+        self._listing_phrases = other._listing_phrases
+        self._phrases = other._phrases
+        self._entries = other._entries
+        self._defer_keys = False
+        self.loaded = True
+        self.abort_rebuild()
+
+    # ---------- queries ----------
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Phrases matching the prefix, best first:
+        exact match, then match at the start of the phrase, then at a later
+        word; ties broken by number of listings, then shorter phrase.
+        """
+        p = normalize(prefix)
+        if not p:
+            return []
+
+        best: dict[str, int] = {}
+        entries = self._entries
+        # (p,) sorts before every (p, phrase, pos) entry
+        i = bisect_left(entries, (p,))
+        while i < len(entries) and entries[i][0].startswith(p):
+            _, norm, pos = entries[i]
+            if pos < best.get(norm, 1 << 30):
+                best[norm] = pos
+            i += 1
+
+        ranked = heapq.nsmallest(
+            limit,
+            best.items(),
+            key=lambda item: (
+                item[0] != p,
+                item[1],
+                -self._phrases[item[0]][1],
+                len(item[0]),
+                item[0],
+            ),
+        )
+        return [
+            {"text": self._phrases[norm][0], "count": self._phrases[norm][1]}
+            for norm, _ in ranked
+        ]
+
+
+# Process-wide index
+suggest_index = SuggestIndex()
+
+
+async def rebuild_suggest_index() -> int:
+    """Rebuild autocomplete from Postgres (fixes any drift). Returns number of phrases."""
+    fresh = SuggestIndex(defer_keys=True)
+    suggest_index.begin_rebuild()
+    try:
+        async with AsyncSessionLocal() as session:
+            res = await session.stream(
+                select(Equipment.id, Equipment.brand, Equipment.model).where(
+                    Equipment.status == EquipmentStatus.APPROVED
+                )
+            )
+            async for row in res:
+                fresh.upsert(row.id, row.brand, row.model)
+    except BaseException:
+        suggest_index.abort_rebuild()
+        raise
+
+    suggest_index.replace_with(fresh)
+    logger.info(f"✅ Equipment suggest index rebuilt ({len(fresh)} phrases)")
+    return len(fresh)
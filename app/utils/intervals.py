@@ -0,0 +1,62 @@
+# app/utils/intervals.py
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+
+def merge_intervals(intervals: Iterable[tuple], lo: datetime, hi: datetime) -> list[tuple[datetime, datetime]]:
+    """Clip intervals to [lo, hi), sort, and merge overlapping/touching ones."""
+    clipped = sorted((max(s, lo), min(e, hi)) for s, e in intervals if s < hi and e > lo)
+    merged: list[list[datetime]] = []
+    for s, e in clipped:
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1][1] = e
+        else:
+            merged.append([s, e])
+    return [(s, e) for s, e in merged]
+
+
+def covers(intervals: Iterable[tuple], start: datetime, end: datetime) -> bool:
+    """True if the union of intervals contains all of [start, end)."""
+    merged = merge_intervals(intervals, start, end)
+    return len(merged) == 1 and merged[0] == (start, end)
+
+
+def subtract_intervals(base: list[tuple], cut: list[tuple]) -> Iterator[tuple[datetime, datetime]]:
+    """
+    Sweep two sorted, merged interval lists and yield the parts of `base`
+    not covered by `cut`, in order. O(len(base) + len(cut)); lazy, so
+    callers that need only the first few gaps stop early.
+    """
+    j = 0
+    for s, e in base:
+        cur = s
+        # Cuts that end before this base interval never matter again
+        while j < len(cut) and cut[j][1] <= cur:
+            j += 1
+        k = j
+        while k < len(cut) and cut[k][0] < e:
+            if cut[k][0] > cur:
+                yield cur, cut[k][0]
+            cur = max(cur, cut[k][1])
+            if cur >= e:
+                break
+            k += 1
+        if cur < e:
+            yield cur, e
+
+
+def free_slots(
+    windows: list[tuple],
+    busy: list[tuple],
+    min_duration: timedelta,
+    count: int,
+) -> list[tuple[datetime, datetime]]:
+    """First `count` gaps of at least min_duration in windows minus busy (both sorted + merged)."""
+    slots = []
+    for s, e in subtract_intervals(windows, busy):
+        if e - s >= min_duration:
+            slots.append((s, e))
+            if len(slots) == count:
+                break
+    return slots
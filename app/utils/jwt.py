@@ -2,11 +2,10 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
-from jose import JWTError, jwt   # use python-jose for consistency
-from app.db.session import AsyncSessionLocal
 from app.db.models.user import User
 from app.core.config import settings
+from app.core.principal import load_principal
+from app.core.security import decode_token, key_ring
 
 # JWT config
 ALGORITHM = settings.jwt_algorithm
@@ -22,41 +21,29 @@ def create_jwt_token(data: dict, expires_delta: timedelta | None = None):
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(
-        to_encode,
-        settings.primary_secret_key,   # ✅ always use newest key
-        algorithm=ALGORITHM,
-    )
+    return key_ring.encode(to_encode)   # ✅ newest key, tagged with its kid
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    """Decode JWT against all keys and return the user"""
+    """Decode JWT and return the user"""
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    for key in settings.all_secret_keys:   # ✅ try all keys for rotation
-        try:
-            payload = jwt.decode(token, key, algorithms=[ALGORITHM])
-            user_id: str = payload.get("sub")
-            if not user_id:
-                raise credentials_exception
-            break
-        except JWTError:
-            continue
-    else:
+    try:
+        payload = decode_token(token)   # ✅ kid picks the key; verified tokens are cached
+    except HTTPException:
+        raise credentials_exception
+    user_id: str = payload.get("sub")
+    if not user_id:
         raise credentials_exception
 
-    # Load user from DB
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-
-        if not user:
-            raise credentials_exception
-
-    return user
+    # Load user (principal cache, DB on a miss)
+    try:
+        return await load_principal(user_id)
+    except HTTPException:
+        raise credentials_exception
 
 
 def require_role(*roles: str):
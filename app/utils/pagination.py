@@ -0,0 +1,37 @@
+# app/utils/pagination.py
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor for a sort key, e.g. encode_cursor(created_at, id)."""
+    raw = json.dumps([_plain(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers) -> tuple:
+    """
+    Inverse of encode_cursor; each parser converts one element back,
+    e.g. decode_cursor(c, datetime.fromisoformat, UUID).
+    Raises 400 on tampered / malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(values) != len(parsers):
+            raise ValueError("cursor arity mismatch")
+        return tuple(parse(v) for parse, v in zip(parsers, values))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
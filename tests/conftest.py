@@ -0,0 +1,92 @@
+# tests/conftest.py
+"""
+Shared fixtures.
+
+Settings are read at import time, so safe defaults are put in the
+environment before anything under app/ is imported:
+
+- Redis is disabled (REDIS_URL empty); tests that need it patch in
+  fakeredis.
+- Database tests run against TEST_DATABASE_URL (a throwaway Postgres with
+  btree_gist / pg_trgm available) and are skipped when it is not set.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", os.environ.get("TEST_DATABASE_URL", "postgresql+asyncpg://localhost/unused"))
+os.environ.setdefault("REDIS_URL", "")
+os.environ.setdefault("JWT_SECRET_KEYS", '["test-secret-new", "test-secret-old"]')
+
+import pytest
+from sqlalchemy import text
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+async def db_engine():
+    """The app's engine, pointed at TEST_DATABASE_URL, with a fresh schema."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from app.db import base
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(base.Base.metadata.drop_all)
+        await conn.run_sync(base.Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(db_engine):
+    """A session on the test DB; every table is emptied afterwards."""
+    from app.db import base
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as s:
+        yield s
+    tables = ", ".join(t.name for t in base.Base.metadata.sorted_tables)
+    async with db_engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+async def fake_redis(monkeypatch):
+    """Swap every module-level redis_client under app/ for one fakeredis instance."""
+    import sys
+
+    import fakeredis
+
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app.") and getattr(module, "redis_client", None) is None and hasattr(module, "redis_client"):
+            monkeypatch.setattr(module, "redis_client", client)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.fixture
+def count_statements(db_engine):
+    """Context manager counting SQL statements sent through the app engine."""
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    @contextmanager
+    def counter():
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+    return counter
@@ -0,0 +1,44 @@
+# tests/factories.py
+"""Minimal row builders for DB tests."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.equipment import Equipment, EquipmentStatus, EquipmentType
+from app.db.models.user import User, UserRole
+
+
+async def make_user(session, role: UserRole = UserRole.OWNER) -> User:
+    user = User(phone_e164=f"+91{uuid4().int % 10**10:010d}", role=role)
+    session.add(user)
+    await session.flush()
+    return user
+
+
+async def make_equipment(session, owner: User, **fields) -> Equipment:
+    values = {
+        "type": EquipmentType.TRACTOR,
+        "daily_rate": 1000,
+        "status": EquipmentStatus.APPROVED,
+        **fields,
+    }
+    eq = Equipment(owner_id=owner.id, **values)
+    session.add(eq)
+    await session.flush()
+    return eq
+
+
+async def make_booking(session, equipment: Equipment, renter: User, **fields) -> Booking:
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=7)
+    values = {
+        "start_ts": start,
+        "end_ts": start + timedelta(days=1),
+        "status": BookingStatus.PENDING,
+        "price_total": equipment.daily_rate,
+        **fields,
+    }
+    booking = Booking(equipment_id=equipment.id, renter_id=renter.id, **values)
+    session.add(booking)
+    await session.flush()
+    return booking
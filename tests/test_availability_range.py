@@ -0,0 +1,11 @@
+# tests/test_availability_range.py
+from fastapi import FastAPI
+
+from app.api.routes.availability import router
+
+
+def test_range_read_is_documented_as_ndjson():
+    app = FastAPI()
+    app.include_router(router)
+    ok = app.openapi()["paths"]["/availability/range"]["get"]["responses"]["200"]
+    assert list(ok["content"]) == ["application/x-ndjson"]
@@ -0,0 +1,74 @@
+# tests/test_booking_expiry.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.user import UserRole
+from app.services import booking_expiry
+from app.services.booking_expiry import EXPIRY_LOCK_KEY, expire_stale_bookings
+
+from tests.factories import make_booking, make_equipment, make_user
+
+
+async def _stale_booking(session) -> Booking:
+    owner = await make_user(session)
+    farmer = await make_user(session, role=UserRole.FARMER)
+    eq = await make_equipment(session, owner)
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    booking = await make_booking(session, eq, farmer, start_ts=start, end_ts=start + timedelta(days=1))
+    await session.commit()
+    return booking
+
+
+async def _lock_is_free(db_engine) -> bool:
+    """Probe from a fresh session: advisory locks are re-entrant within the pooled one."""
+    probe = create_async_engine(db_engine.url, poolclass=NullPool)
+    try:
+        async with probe.connect() as conn:
+            got = (await conn.execute(select(func.pg_try_advisory_lock(EXPIRY_LOCK_KEY)))).scalar()
+            if got:
+                await conn.execute(select(func.pg_advisory_unlock(EXPIRY_LOCK_KEY)))
+            await conn.commit()
+    finally:
+        await probe.dispose()
+    return got
+
+
+async def test_failed_sweep_releases_the_advisory_lock(session, db_engine, monkeypatch):
+    booking = await _stale_booking(session)
+
+    async def broken(*equipment_ids):
+        raise RuntimeError("cache down")
+
+    monkeypatch.setattr(booking_expiry, "invalidate_calendars", broken)
+    with pytest.raises(RuntimeError):
+        await expire_stale_bookings()
+    assert await _lock_is_free(db_engine)
+
+    monkeypatch.undo()
+    await expire_stale_bookings()  # not skipped: the next run gets the lock
+    session.expunge_all()
+    assert (await session.get(Booking, booking.id)).status == BookingStatus.EXPIRED
+
+
+async def test_failed_chunk_statement_releases_the_advisory_lock(session, db_engine, monkeypatch):
+    await _stale_booking(session)
+    monkeypatch.setattr(booking_expiry, "_expire_chunk", lambda *args: select(func.not_a_function()))
+    with pytest.raises(Exception):
+        await expire_stale_bookings()
+    assert await _lock_is_free(db_engine)
+
+
+async def test_only_sweeps_that_expire_something_log(session, monkeypatch):
+    lines = []
+    monkeypatch.setattr(booking_expiry.logger, "info", lines.append)
+    assert await expire_stale_bookings() == 0
+    assert lines == []
+
+    await _stale_booking(session)
+    assert await expire_stale_bookings() == 1
+    assert lines == ["✅ Booking expiry: 1 PENDING bookings expired"]
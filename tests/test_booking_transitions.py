@@ -0,0 +1,42 @@
+# tests/test_booking_transitions.py
+import asyncio
+
+from fastapi import HTTPException
+
+from app.db.models.booking import Booking, BookingStatus
+from app.db.models.user import UserRole
+from app.db.session import AsyncSessionLocal
+from app.services.booking import commit_transition, transition
+
+from tests.factories import make_booking, make_equipment, make_user
+
+
+async def test_concurrent_transitions_exactly_one_wins(session):
+    owner = await make_user(session)
+    farmer = await make_user(session, role=UserRole.FARMER)
+    eq = await make_equipment(session, owner)
+    booking = await make_booking(session, eq, farmer)
+    await session.commit()
+
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        # Both requests read version 1 before either writes
+        a = await first.get(Booking, booking.id)
+        b = await second.get(Booking, booking.id)
+        transition(a, BookingStatus.ACCEPTED)
+        transition(b, BookingStatus.REJECTED)
+
+        results = await asyncio.gather(
+            commit_transition(first),
+            commit_transition(second),
+            return_exceptions=True,
+        )
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], HTTPException) and errors[0].status_code == 409
+
+    winner = BookingStatus.ACCEPTED if results[0] is None else BookingStatus.REJECTED
+    session.expunge_all()
+    stored = await session.get(Booking, booking.id)
+    assert stored.status == winner
+    assert stored.version == 2
@@ -0,0 +1,71 @@
+# tests/test_calendar.py
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.routes.equipment import delete_equipment, get_equipment_calendar, router
+from app.core.principal import principal_cache
+from app.core.security import create_access_token
+from app.db.models.equipment import EquipmentStatus
+from app.db.models.user import UserRole
+from app.services.calendar import calendar_cache, parse_month
+
+from tests.factories import make_equipment, make_user
+
+
+@pytest.fixture(autouse=True)
+def _empty_local_cache():
+    calendar_cache._local.clear()
+    principal_cache._local.clear()
+
+
+def _client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/equipment")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_parse_month_bounds():
+    assert parse_month("2026-12") == (
+        datetime(2026, 12, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    )
+    assert parse_month("9998-12")[1] == datetime(9999, 1, 1, tzinfo=timezone.utc)
+    for bad in ("9999-12", "9999-01", "0000-05", "2026-13", "2026", "2026-05-01", "may"):
+        with pytest.raises(HTTPException) as exc:
+            parse_month(bad)
+        assert exc.value.status_code == 400, bad
+
+
+async def test_deleted_machine_calendar_is_not_served_from_cache(session, fake_redis):
+    owner = await make_user(session)
+    eq = await make_equipment(session, owner, status=EquipmentStatus.PENDING_REVIEW)
+    await session.commit()
+
+    response = await get_equipment_calendar(eq.id, "2026-11", session)
+    assert response.status_code == 200
+
+    await delete_equipment(eq.id, session, eq)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_equipment_calendar(eq.id, "2026-11", session)
+    assert exc.value.status_code == 404
+
+
+async def test_calendar_requires_a_signed_in_owner_or_farmer(session, fake_redis):
+    owner = await make_user(session)
+    farmer = await make_user(session, role=UserRole.FARMER)
+    eq = await make_equipment(session, owner)
+    await session.commit()
+    url = f"/api/equipment/{eq.id}/calendar?month=2026-11"
+
+    async with _client() as client:
+        anonymous = await client.get(url)
+        assert anonymous.status_code == 401
+
+        token = create_access_token({"sub": str(farmer.id), "role": farmer.role.value})
+        signed_in = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert signed_in.status_code == 200
+        assert signed_in.json()["month"] == "2026-11"
@@ -0,0 +1,45 @@
+# tests/test_equipment_detail.py
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.routes.equipment import get_equipment
+from app.services.equipment import equipment_cache
+
+from tests.factories import make_equipment, make_user
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def _empty_local_cache():
+    equipment_cache._local.clear()
+
+
+async def test_unknown_id_does_not_create_redis_keys(session, fake_redis):
+    with pytest.raises(HTTPException) as exc:
+        await get_equipment(uuid4(), _request(), session)
+    assert exc.value.status_code == 404
+    assert await fake_redis.keys("*") == []
+
+
+async def test_existing_row_gets_etag_after_first_read(session, fake_redis):
+    owner = await make_user(session)
+    eq = await make_equipment(session, owner)
+    await session.commit()
+    session.expunge_all()  # requests start with an empty identity map
+
+    first = await get_equipment(eq.id, _request(), session)
+    assert first.status_code == 200
+    assert "etag" not in first.headers
+
+    second = await get_equipment(eq.id, _request(), session)
+    etag = second.headers["etag"]
+
+    third = await get_equipment(eq.id, _request(etag), session)
+    assert third.status_code == 304
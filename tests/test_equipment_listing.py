@@ -0,0 +1,46 @@
+# tests/test_equipment_listing.py
+from app.db.models.equipment import EquipmentType
+from app.services.equipment import EquipmentSort, list_approved_equipment_page
+
+from tests.factories import make_equipment, make_user
+
+
+async def test_operator_facet_matches_filtered_results(session):
+    owner = await make_user(session)
+    await make_equipment(session, owner, operator_included=True)
+    await make_equipment(session, owner, operator_included=False)
+    await make_equipment(session, owner, operator_included=None)
+    await make_equipment(session, owner, operator_included=None, type=EquipmentType.SPRAYER)
+    await session.commit()
+
+    page = await list_approved_equipment_page(session, operator_included=False)
+
+    assert len(page["items"]) == 3
+    assert page["facets"]["total"] == 3
+    assert page["facets"]["operator_included"] == {False: 3, True: 1}
+    assert page["facets"]["types"] == {EquipmentType.TRACTOR: 2, EquipmentType.SPRAYER: 1}
+
+
+async def test_empty_first_page_still_has_facets(session):
+    owner = await make_user(session)
+    await make_equipment(session, owner, type=EquipmentType.HARVESTER)
+    await session.commit()
+
+    page = await list_approved_equipment_page(session, type_=EquipmentType.PLOUGH)
+
+    assert page["items"] == []
+    assert page["facets"]["total"] == 0
+    assert page["facets"]["types"] == {EquipmentType.HARVESTER: 1}
+
+
+async def test_first_page_order_and_cursor(session):
+    owner = await make_user(session)
+    for rate in (300, 100, 200):
+        await make_equipment(session, owner, daily_rate=rate)
+    await session.commit()
+
+    first = await list_approved_equipment_page(session, limit=2, sort=EquipmentSort.PRICE_ASC)
+    assert [i["daily_rate"] for i in first["items"]] == [100, 200]
+    rest = await list_approved_equipment_page(session, limit=2, sort=EquipmentSort.PRICE_ASC, cursor=first["next_cursor"])
+    assert [i["daily_rate"] for i in rest["items"]] == [300]
+    assert rest["facets"] is None
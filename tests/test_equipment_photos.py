@@ -0,0 +1,41 @@
+# tests/test_equipment_photos.py
+from app.db.models.equipment import EquipmentPhoto
+from app.services.equipment import EquipmentSort, list_approved_equipment_page
+
+from tests.factories import make_equipment, make_user
+
+PAGE_SIZE = 100
+
+
+async def _catalogue(session, machines: int) -> None:
+    owner = await make_user(session)
+    for i in range(machines):
+        eq = await make_equipment(session, owner, daily_rate=100 + i)
+        for position in (2, None, 1)[: 1 + i % 3]:
+            session.add(EquipmentPhoto(equipment_id=eq.id, url=f"https://cdn/{eq.id}/{position}", position=position))
+    await session.commit()
+
+
+async def test_100_item_page_uses_constant_statement_count(session, count_statements):
+    await _catalogue(session, PAGE_SIZE * 2 + 5)
+
+    with count_statements() as first:
+        page = await list_approved_equipment_page(session, limit=PAGE_SIZE, sort=EquipmentSort.PRICE_ASC)
+    with count_statements() as second:
+        nxt = await list_approved_equipment_page(
+            session, limit=PAGE_SIZE, sort=EquipmentSort.PRICE_ASC, cursor=page["next_cursor"]
+        )
+
+    assert len(page["items"]) == len(nxt["items"]) == PAGE_SIZE
+    # page (+ facets, same statement) and one IN query for all photos
+    assert len(first) == 2
+    assert len(second) == 2
+
+
+async def test_photos_are_embedded_in_position_order(session):
+    await _catalogue(session, 3)
+
+    page = await list_approved_equipment_page(session, limit=PAGE_SIZE, sort=EquipmentSort.PRICE_ASC)
+
+    positions = [[p["position"] for p in item["photos"]] for item in page["items"]]
+    assert positions == [[2], [2, None], [1, 2, None]]
@@ -0,0 +1,81 @@
+# tests/test_fleet_import.py
+import csv
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import fleet_import
+from app.services.fleet_import import iter_csv_rows, iter_lines, iter_ndjson_rows
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _rows(body: bytes, parser=iter_csv_rows, chunk: int = 7) -> list:
+    parts = [body[i:i + chunk] for i in range(0, len(body), chunk)]
+    return [row async for row in parser(iter_lines(_chunks(*parts)))]
+
+
+async def test_csv_quoted_field_with_embedded_newline_is_one_row():
+    body = (
+        'type,brand,daily_rate\r\n'
+        'TRACTOR,"Mahindra\n575 DI\n\nwith ""rotavator""",1200\r\n'
+        'SPRAYER,Aspee,300\n'
+    ).encode()
+
+    rows = await _rows(body)
+
+    assert rows == [
+        (1, {"type": "TRACTOR", "brand": 'Mahindra\n575 DI\n\nwith "rotavator"', "daily_rate": "1200"}, None),
+        (2, {"type": "SPRAYER", "brand": "Aspee", "daily_rate": "300"}, None),
+    ]
+
+
+async def test_csv_rows_match_the_csv_module():
+    records = [
+        ["type", "brand", "model"],
+        ["PLOUGH", 'disc 5" wide', "x"],
+        ["OTHER", "a,b", 'multi\nline "quoted"'],
+        ["TRACTOR", "", "last"],
+    ]
+    out = io.StringIO()
+    csv.writer(out).writerows(records)
+
+    rows = await _rows(out.getvalue().encode(), chunk=3)
+
+    expected = [
+        {k: v for k, v in zip(records[0], r) if v}
+        for r in records[1:]
+    ]
+    assert [record for _, record, _ in rows] == expected
+
+
+async def test_csv_unterminated_quote_is_reported():
+    rows = await _rows(b'type,brand\nTRACTOR,"never closed\n')
+    assert rows == [(1, None, "unterminated quoted field")]
+
+
+async def test_line_without_newline_is_capped(monkeypatch):
+    monkeypatch.setattr(fleet_import, "MAX_LINE_CHARS", 100)
+    with pytest.raises(HTTPException) as exc:
+        await _rows(b"x" * 500, parser=iter_ndjson_rows)
+    assert exc.value.status_code == 400
+
+
+async def test_csv_record_spanning_many_lines_is_capped(monkeypatch):
+    monkeypatch.setattr(fleet_import, "MAX_LINE_CHARS", 100)
+    body = b'type,brand\nTRACTOR,"' + b"line\n" * 50 + b'"\n'
+    with pytest.raises(HTTPException) as exc:
+        await _rows(body)
+    assert exc.value.status_code == 400
+
+
+async def test_body_size_is_capped(monkeypatch):
+    monkeypatch.setattr(fleet_import, "MAX_BODY_BYTES", 1000)
+    body = b'{"type": "TRACTOR"}\n' * 100
+    with pytest.raises(HTTPException) as exc:
+        await _rows(body, parser=iter_ndjson_rows)
+    assert exc.value.status_code == 413
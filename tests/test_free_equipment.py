@@ -0,0 +1,55 @@
+# tests/test_free_equipment.py
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.db.models.availability import Availability, AvailabilityRule
+from app.services.availability import RULE_OVERFETCH, find_free_equipment
+
+from tests.factories import make_equipment, make_user
+
+# Tuesday 2026-11-03, 08:00–12:00 UTC
+START = datetime(2026, 11, 3, 8, tzinfo=timezone.utc)
+END = START + timedelta(hours=4)
+MONDAYS = 0b0000001
+LAT, LON = 18.52, 73.85
+
+
+def _at(rate: int) -> dict:
+    """Farther away the pricier it is, so both sort orders agree."""
+    return {"lat": LAT + rate * 0.0001, "lon": LON}
+
+
+async def test_rejected_rule_matches_do_not_shorten_the_result(session):
+    owner = await make_user(session)
+    limit = 2
+    # A full page of the cheapest candidates only have a Monday rule: admitted by SQL, rejected in memory
+    for rate in range(limit * RULE_OVERFETCH + 1):
+        eq = await make_equipment(session, owner, daily_rate=100 + rate, **_at(rate))
+        session.add(AvailabilityRule(
+            equipment_id=eq.id,
+            owner_id=owner.id,
+            weekdays=MONDAYS,
+            start_time=time(0),
+            end_time=time(23, 59),
+            timezone="UTC",
+            valid_from=date(2026, 1, 1),
+        ))
+    free = []
+    for rate in (500, 600, 700):
+        eq = await make_equipment(session, owner, daily_rate=rate, **_at(rate))
+        session.add(Availability(
+            equipment_id=eq.id,
+            owner_id=owner.id,
+            start_ts=START - timedelta(days=1),
+            end_ts=END + timedelta(days=1),
+        ))
+        free.append(eq.id)
+    await session.commit()
+
+    items = await find_free_equipment(session, START, END, limit=limit)
+    assert [i["id"] for i in items] == free[:limit]
+
+    everything = await find_free_equipment(session, START, END, limit=10)
+    assert [i["id"] for i in everything] == free
+
+    nearest = await find_free_equipment(session, START, END, lat=LAT, lon=LON, radius_km=50, limit=limit)
+    assert [i["id"] for i in nearest] == free[:limit]
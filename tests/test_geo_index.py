@@ -0,0 +1,55 @@
+# tests/test_geo_index.py
+from uuid import uuid4
+
+from app.services.geo_index import GeoGridIndex
+
+
+def test_rebuild_replays_mutations_made_while_loading():
+    live = GeoGridIndex()
+    kept, moved, removed, added = uuid4(), uuid4(), uuid4(), uuid4()
+    for eq_id in (kept, moved, removed):
+        live.upsert(eq_id, 18.52, 73.85, 1000)
+
+    # Rebuild starts; the DB snapshot is read before the writes below land
+    live.begin_rebuild()
+    fresh = GeoGridIndex()
+    for eq_id in (kept, moved, removed):
+        fresh.upsert(eq_id, 18.52, 73.85, 1000)
+
+    live.upsert(moved, 19.07, 72.87, 1500)
+    live.remove(removed)
+    live.upsert(added, 18.60, 73.80, 800)
+
+    live.replace_with(fresh)
+
+    assert len(live) == 3
+    assert [p["id"] for p in live.query_radius(19.07, 72.87, 5)] == [moved]
+    assert live.query_radius(19.07, 72.87, 5)[0]["daily_rate"] == 1500
+    assert removed not in {p["id"] for p in live.query_radius(18.52, 73.85, 50)}
+    assert added in {p["id"] for p in live.query_radius(18.60, 73.80, 1)}
+    assert live._journal is None
+
+
+def test_overlapping_rebuilds_keep_journaling_until_the_last_swap():
+    live = GeoGridIndex()
+    live.begin_rebuild()
+    live.begin_rebuild()
+    first = GeoGridIndex()
+    eq_id = uuid4()
+    live.upsert(eq_id, 18.52, 73.85, 1000)
+
+    live.replace_with(first)
+    assert live._journal is not None
+
+    second = GeoGridIndex()
+    live.replace_with(second)
+    assert len(live) == 1
+    assert live._journal is None
+
+
+def test_aborted_rebuild_stops_journaling():
+    live = GeoGridIndex()
+    live.begin_rebuild()
+    live.abort_rebuild()
+    live.upsert(uuid4(), 18.52, 73.85, 1000)
+    assert live._journal is None
@@ -0,0 +1,45 @@
+# tests/test_jwt_keys.py
+import base64
+import json
+import time
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.jwt_keys import KeyRing, TokenCache, decode_cached
+
+SECRETS = ["new-secret", "old-secret"]
+
+
+def _b64(obj) -> str:
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+
+def _forged(header) -> str:
+    return f"{_b64(header)}.{_b64({'sub': 'x', 'exp': int(time.time()) + 60})}.c2ln"
+
+
+def test_current_and_legacy_tokens_verify():
+    ring = KeyRing(SECRETS, "HS256")
+    claims = {"sub": "user-1", "exp": int(time.time()) + 60}
+    assert ring.decode(ring.encode(claims))["sub"] == "user-1"
+    legacy = jwt.encode(claims, SECRETS[-1], algorithm="HS256")
+    assert ring.decode(legacy)["sub"] == "user-1"
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        _forged({"alg": "HS256", "kid": []}),
+        _forged({"alg": "HS256", "kid": {"id": "x"}}),
+        _forged({"alg": "HS256", "kid": 5}),
+        _forged({"alg": "HS256", "kid": "rotated-out"}),
+        _forged(["not", "an", "object"]),
+        "not-a-token",
+        "",
+    ],
+)
+def test_malformed_headers_raise_jwt_error(token):
+    ring = KeyRing(SECRETS, "HS256")
+    with pytest.raises(JWTError):
+        decode_cached(ring, TokenCache(), token)
@@ -0,0 +1,67 @@
+# tests/test_pricing.py
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.booking import BookingCreate, BookingQuoteRequest
+from app.services.pricing import price_booking, quote_many
+
+START = datetime(2026, 11, 2, 6, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "duration, days, hours, total",
+    [
+        (timedelta(days=2, hours=5), 3, 0, 3000),  # a started day is billed in full
+        (timedelta(days=1), 1, 0, 1000),
+        (timedelta(hours=3, minutes=50), 0, 4, 600),  # a started hour is billed in full
+        (timedelta(hours=3), 0, 3, 450),
+        (timedelta(minutes=20), 0, 1, 150),
+    ],
+)
+def test_price_booking_rounding(duration, days, hours, total):
+    quote = price_booking(1000, 150, START, START + duration)
+    assert (quote["billed_days"], quote["billed_hours"], quote["price_total"]) == (days, hours, total)
+    assert quote["commission_fee"] + quote["owner_payout"] == total
+
+
+def test_quote_many_reports_a_naive_item_instead_of_failing_the_batch():
+    eq_id = uuid4()
+    naive = START.replace(tzinfo=None)
+    quotes = quote_many(
+        {eq_id: (1000, None)},
+        [
+            (eq_id, START, START + timedelta(days=1)),
+            (eq_id, naive, START + timedelta(days=1)),
+            (uuid4(), START, START + timedelta(days=1)),
+        ],
+    )
+    assert quotes[0]["price_total"] == 1000
+    assert quotes[1]["error"] == "Timestamps must include a timezone offset"
+    assert quotes[2]["error"] == "Equipment not found"
+
+
+def test_schemas_reject_naive_timestamps():
+    eq_id = str(uuid4())
+    with pytest.raises(ValidationError):
+        BookingQuoteRequest(items=[{
+            "equipment_id": eq_id,
+            "start_ts": "2026-11-02T06:00:00",
+            "end_ts": "2026-11-03T06:00:00+00:00",
+        }])
+
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    with pytest.raises(ValidationError):
+        BookingCreate(
+            equipment_id=eq_id,
+            start_ts=start.isoformat(),
+            end_ts=(start + timedelta(days=1)).replace(tzinfo=None).isoformat(),
+        )
+    booking = BookingCreate(
+        equipment_id=eq_id,
+        start_ts=start.isoformat(),
+        end_ts=(start + timedelta(days=1)).isoformat(),
+    )
+    assert booking.end_ts > booking.start_ts
@@ -0,0 +1,111 @@
+# tests/test_slot_holds.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.routes.booking import router
+from app.core.config import settings
+from app.core.principal import principal_cache
+from app.core.security import create_access_token
+from app.db.models.user import UserRole
+from app.services.slot_holds import acquire_hold, ensure_not_held, release_hold
+
+from tests.factories import make_user
+
+START = datetime(2026, 11, 2, tzinfo=timezone.utc)  # midnight: _days(n) touches n UTC days
+
+
+def _days(n: int) -> tuple[datetime, datetime]:
+    return START, START + timedelta(days=n)
+
+
+async def test_first_hold_wins_and_the_loser_gets_409(fake_redis):
+    eq_id, alice, bob = uuid4(), uuid4(), uuid4()
+    hold = await acquire_hold(alice, eq_id, *_days(2))
+    assert hold["token"].startswith(f"{eq_id}.")
+
+    with pytest.raises(HTTPException) as exc:
+        await acquire_hold(bob, eq_id, START + timedelta(days=1), START + timedelta(days=3))
+    assert exc.value.status_code == 409
+    assert "2026-11-03" in exc.value.detail
+
+    # Nothing of bob's was written, and his booking is blocked too
+    assert await fake_redis.keys(f"*{bob}*") == []
+    with pytest.raises(HTTPException) as exc:
+        await ensure_not_held(bob, eq_id, *_days(1), None)
+    assert exc.value.status_code == 409
+    await ensure_not_held(alice, eq_id, *_days(2), hold["token"])
+
+
+async def test_same_user_rehold_replaces_their_previous_hold(fake_redis):
+    eq_id, alice, bob = uuid4(), uuid4(), uuid4()
+    first = await acquire_hold(alice, eq_id, *_days(3))
+    second = await acquire_hold(alice, eq_id, START + timedelta(days=2), START + timedelta(days=4))
+    assert second["token"] != first["token"]
+
+    # Days only the old hold covered are free again; the old token is gone
+    await acquire_hold(bob, eq_id, *_days(2))
+    assert await fake_redis.get(f"hold:{{{eq_id}}}:token:{first['token']}") is None
+    with pytest.raises(HTTPException):
+        await acquire_hold(bob, eq_id, START + timedelta(days=3), START + timedelta(days=4))
+
+
+async def test_holds_expire_after_the_ttl(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "slot_hold_ttl_seconds", 1)
+    eq_id = uuid4()
+    await acquire_hold(uuid4(), eq_id, *_days(1))
+    with pytest.raises(HTTPException):
+        await acquire_hold(uuid4(), eq_id, *_days(1))
+
+    await asyncio.sleep(1.1)
+    assert await fake_redis.keys("hold:*") == []
+    assert await acquire_hold(uuid4(), eq_id, *_days(1))
+
+
+async def test_release_deletes_only_keys_the_token_owns(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "slot_hold_ttl_seconds", 1)
+    eq_id, alice, bob = uuid4(), uuid4(), uuid4()
+    stale = await acquire_hold(alice, eq_id, *_days(2))
+    await asyncio.sleep(1.1)  # alice's hold lapses and bob takes the first day
+
+    monkeypatch.setattr(settings, "slot_hold_ttl_seconds", 300)
+    held = await acquire_hold(bob, eq_id, *_days(1))
+    # Re-create alice's token payload as if it had outlived its day keys
+    await fake_redis.set(
+        f"hold:{{{eq_id}}}:token:{stale['token']}",
+        f'{{"user_id": "{alice}", "start_ts": "{START.isoformat()}", "end_ts": "{(START + timedelta(days=2)).isoformat()}"}}',
+    )
+
+    assert await release_hold(stale["token"]) == 0
+    assert await fake_redis.get(f"hold:{{{eq_id}}}:2026-11-02") == f"{bob}:{held['token']}"
+    assert await fake_redis.get(f"hold:{{{eq_id}}}:token:{stale['token']}") is None
+
+    assert await release_hold(held["token"]) == 1
+    assert await fake_redis.keys("hold:*") == []
+
+
+async def test_hold_request_with_a_naive_timestamp_is_rejected(session, fake_redis):
+    principal_cache._local.clear()
+    farmer = await make_user(session, role=UserRole.FARMER)
+    await session.commit()
+    app = FastAPI()
+    app.include_router(router)
+    token = create_access_token({"sub": str(farmer.id), "role": farmer.role.value})
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/bookings/holds",
+            json={
+                "equipment_id": str(uuid4()),
+                "start_ts": "2026-11-02T06:00:00",
+                "end_ts": "2026-11-03T06:00:00+00:00",
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "start_ts"]
+    assert await fake_redis.keys("hold:*") == []
@@ -0,0 +1,78 @@
+# tests/test_suggest.py
+from uuid import uuid4
+
+from app.services.suggest import SuggestIndex, _suffix_entries
+
+
+def _texts(index: SuggestIndex, prefix: str) -> list[str]:
+    return [s["text"] for s in index.suggest(prefix)]
+
+
+def test_writes_keep_keys_sorted_without_a_rebuild_on_read():
+    index = SuggestIndex()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    index.upsert(a, "Mahindra", "575 DI")
+    index.upsert(b, "Mahindra", "475 DI")
+    index.upsert(c, "Swaraj", "744 FE")
+
+    assert index._entries == sorted(index._entries)
+    assert _texts(index, "mah") == ["Mahindra", "Mahindra 475 DI", "Mahindra 575 DI"]
+    assert _texts(index, "di") == ["Mahindra 475 DI", "Mahindra 575 DI"]
+
+    index.upsert(a, "Sonalika", "DI 750")
+    index.remove(c)
+
+    assert index._entries == sorted(index._entries)
+    assert _texts(index, "mahindra") == ["Mahindra", "Mahindra 475 DI"]
+    assert _texts(index, "swa") == []
+    assert _texts(index, "di") == ["Sonalika DI 750", "Mahindra 475 DI"]
+    expected = sorted(e for norm in index._phrases for e in _suffix_entries(norm))
+    assert index._entries == expected
+
+
+def test_shared_phrase_keys_stay_until_the_last_listing_goes():
+    index = SuggestIndex()
+    a, b = uuid4(), uuid4()
+    index.upsert(a, "John Deere", "5050 D")
+    index.upsert(b, "John Deere", "5310")
+
+    index.remove(a)
+    assert index.suggest("john") == [
+        {"text": "John Deere", "count": 1},
+        {"text": "John Deere 5310", "count": 1},
+    ]
+    index.remove(b)
+    assert index._entries == []
+    assert index.suggest("john") == []
+
+
+def test_rebuild_sorts_once_and_replays_mutations_made_while_loading():
+    live = SuggestIndex()
+    kept, renamed, removed, added = uuid4(), uuid4(), uuid4(), uuid4()
+    for eq_id in (kept, renamed, removed):
+        live.upsert(eq_id, "Kubota", "MU4501")
+
+    live.begin_rebuild()
+    fresh = SuggestIndex(defer_keys=True)
+    for eq_id in (kept, renamed, removed):
+        fresh.upsert(eq_id, "Kubota", "MU4501")
+    assert fresh._entries == []
+
+    live.upsert(renamed, "Eicher", "380")
+    live.remove(removed)
+    live.upsert(added, "Kubota", "NeoStar")
+
+    live.replace_with(fresh)
+
+    assert live.loaded and live._journal is None
+    assert live._entries == sorted(live._entries)
+    assert live.suggest("kubota") == [
+        {"text": "Kubota", "count": 2},
+        {"text": "Kubota MU4501", "count": 1},
+        {"text": "Kubota NeoStar", "count": 1},
+    ]
+    assert _texts(live, "eich") == ["Eicher", "Eicher 380"]
+
+    # Writes after the swap go straight into the sorted keys again
+    live.upsert(uuid4(), "Escorts", "Powertrac")
+    assert _texts(live, "power") == ["Escorts Powertrac"]